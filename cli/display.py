@@ -2,7 +2,11 @@
 Rich-based display components for visual output
 """
 
-from typing import List, Dict, Any
+import array
+import sys
+from collections import defaultdict, deque
+from itertools import islice
+from typing import List, Dict, Any, Optional
 from rich.console import Console
 from rich.tree import Tree
 from rich.table import Table
@@ -17,55 +21,172 @@ from cli.prompts import select_paths_to_process
 console = Console()
 
 class SiteMap:
-    """Represents the discovered site structure"""
-    
+    """
+    Represents the discovered site structure
+
+    URLs are interned to integer IDs and page attributes live in parallel
+    arrays, so large crawls avoid one 3-key dict per page and repeated URL
+    hashing. Links and files are append-only arrays of IDs; per-page
+    adjacency is built lazily on first read and invalidated on append.
+    """
+
     def __init__(self, root_url: str):
         self.root_url = root_url
-        self.pages = {}  # url -> page info
-        self.links = {}  # url -> list of linked urls
-        self.files = {}  # url -> list of downloadable files
-    
+        self._url_ids: Dict[str, int] = {}       # url -> integer ID
+        self._urls: List[str] = []               # ID -> url
+        self._basenames: List[str] = []          # ID -> url tail, for display
+        self._titles: List[str] = []
+        self._depths = array.array('i')
+        self._processed = bytearray()
+        self._is_page = bytearray()
+        self._page_order: List[int] = []         # page IDs in discovery order
+        # Links as parallel (src, dst) ID arrays, deduplicated on append
+        self._link_src = array.array('i')
+        self._link_dst = array.array('i')
+        self._link_seen: set = set()
+        # Files as parallel (src page ID, file url, file type) arrays
+        self._file_src = array.array('i')
+        self._file_urls: List[str] = []
+        self._file_names: List[str] = []
+        self._file_types: List[str] = []
+        # Lazily built ID -> entries indexes
+        self._link_index: Optional[Dict[int, List[int]]] = None
+        self._file_index: Optional[Dict[int, List[int]]] = None
+        # Cached get_all_paths result, invalidated when a page is added
+        self._paths_cache: Optional[tuple] = None
+
+    def _intern(self, url: str) -> int:
+        """Intern a URL to its integer ID, creating a slot on first sight"""
+        # sys.intern collapses duplicate URL strings to one object, so
+        # repeated dict probes hit CPython's pointer-identity fast path
+        url = sys.intern(url)
+        url_id = self._url_ids.get(url)
+        if url_id is None:
+            url_id = len(self._urls)
+            self._url_ids[url] = url_id
+            self._urls.append(url)
+            # rpartition avoids the list split('/') allocates per URL
+            self._basenames.append(url.rpartition('/')[2] or url)
+            self._titles.append('')
+            self._depths.append(-1)
+            self._processed.append(0)
+            self._is_page.append(0)
+        return url_id
+
     def add_page(self, url: str, title: str = "", depth: int = 0):
         """Add a page to the site map"""
-        self.pages[url] = {
-            'title': title,
-            'depth': depth,
-            'processed': False
-        }
-        if url not in self.links:
-            self.links[url] = []
-        if url not in self.files:
-            self.files[url] = []
-    
+        url_id = self._intern(url)
+        self._titles[url_id] = title
+        self._depths[url_id] = depth
+        if not self._is_page[url_id]:
+            self._is_page[url_id] = 1
+            self._page_order.append(url_id)
+            self._paths_cache = None
+
     def add_link(self, from_url: str, to_url: str):
         """Add a link between pages"""
-        if from_url not in self.links:
-            self.links[from_url] = []
-        if to_url not in self.links[from_url]:
-            self.links[from_url].append(to_url)
-    
+        src = self._intern(from_url)
+        dst = self._intern(to_url)
+        if (src, dst) not in self._link_seen:
+            self._link_seen.add((src, dst))
+            self._link_src.append(src)
+            self._link_dst.append(dst)
+            self._link_index = None
+
     def add_file(self, page_url: str, file_url: str, file_type: str):
         """Add a downloadable file found on a page"""
-        if page_url not in self.files:
-            self.files[page_url] = []
-        self.files[page_url].append({
-            'url': file_url,
-            'type': file_type
-        })
-    
-    def get_all_paths(self) -> List[str]:
-        """Get all discovered URLs"""
-        return list(self.pages.keys())
-    
+        self._file_src.append(self._intern(page_url))
+        self._file_urls.append(file_url)
+        self._file_names.append(file_url.rpartition('/')[2] or file_url)
+        self._file_types.append(file_type)
+        self._file_index = None
+
+    def get_title(self, url: str) -> str:
+        """Get the recorded title for a URL ('' if unknown)"""
+        url_id = self._url_ids.get(sys.intern(url))
+        return self._titles[url_id] if url_id is not None else ''
+
+    def get_basename(self, url: str) -> str:
+        """Get the precomputed display name (URL tail) for a URL"""
+        url_id = self._url_ids.get(sys.intern(url))
+        if url_id is not None:
+            return self._basenames[url_id]
+        return url.rpartition('/')[2] or url
+
+    def get_links(self, url: str) -> List[str]:
+        """Get the URLs linked from a page"""
+        url_id = self._url_ids.get(sys.intern(url))
+        if url_id is None:
+            return []
+        if self._link_index is None:
+            index = defaultdict(list)
+            for src, dst in zip(self._link_src, self._link_dst):
+                index[src].append(dst)
+            self._link_index = dict(index)
+        return [self._urls[dst] for dst in self._link_index.get(url_id, ())]
+
+    def get_files(self, url: str) -> List[tuple]:
+        """Get (file_name, file_type) pairs found on a page"""
+        url_id = self._url_ids.get(sys.intern(url))
+        if url_id is None:
+            return []
+        if self._file_index is None:
+            index = defaultdict(list)
+            for pos, src in enumerate(self._file_src):
+                index[src].append(pos)
+            self._file_index = dict(index)
+        return [(self._file_names[pos], self._file_types[pos])
+                for pos in self._file_index.get(url_id, ())]
+
+    def get_all_paths(self) -> tuple:
+        """Get all discovered URLs (cached; callers only iterate/len/slice)"""
+        if self._paths_cache is None:
+            self._paths_cache = tuple(self._urls[url_id] for url_id in self._page_order)
+        return self._paths_cache
+
     def get_stats(self) -> Dict[str, int]:
         """Get statistics about the site map"""
-        total_files = sum(len(files) for files in self.files.values())
         return {
-            'pages': len(self.pages),
-            'links': sum(len(links) for links in self.links.values()),
-            'files': total_files
+            'pages': len(self._page_order),
+            'links': len(self._link_src),
+            'files': len(self._file_src)
         }
 
+    # Dict-shaped views kept for callers that still expect the original
+    # url-keyed layout. These materialize on every access — hot paths
+    # should use the accessors above instead.
+
+    @property
+    def pages(self) -> Dict[str, Dict[str, Any]]:
+        """url -> page info view"""
+        return {
+            self._urls[url_id]: {
+                'title': self._titles[url_id],
+                'depth': self._depths[url_id],
+                'processed': bool(self._processed[url_id])
+            }
+            for url_id in self._page_order
+        }
+
+    @property
+    def links(self) -> Dict[str, List[str]]:
+        """url -> linked urls view"""
+        index: Dict[str, List[str]] = {self._urls[url_id]: [] for url_id in self._page_order}
+        for src, dst in zip(self._link_src, self._link_dst):
+            index.setdefault(self._urls[src], []).append(self._urls[dst])
+        return index
+
+    @property
+    def files(self) -> Dict[str, List[Dict[str, str]]]:
+        """url -> downloadable files view"""
+        index: Dict[str, List[Dict[str, str]]] = {self._urls[url_id]: [] for url_id in self._page_order}
+        for pos, src in enumerate(self._file_src):
+            index.setdefault(self._urls[src], []).append({
+                'url': self._file_urls[pos],
+                'type': self._file_types[pos]
+            })
+        return index
+
 def display_site_map(site_map: SiteMap) -> List[str]:
     """
     Display the site map as an interactive tree and get user selections
@@ -76,7 +197,7 @@ def display_site_map(site_map: SiteMap) -> List[str]:
     tree = Tree(f"🌐 [bold blue]{site_map.root_url}[/bold blue]")
     
     # Build tree structure
-    _build_tree_recursive(tree, site_map, site_map.root_url, visited=set(), max_depth=3)
+    _build_tree(tree, site_map, site_map.root_url, max_depth=3)
     
     # Display the tree
     console.print(tree)
@@ -96,35 +217,34 @@ def display_site_map(site_map: SiteMap) -> List[str]:
     
     return selected_paths
 
-def _build_tree_recursive(parent_node, site_map: SiteMap, url: str, visited: set, max_depth: int, current_depth: int = 0):
-    """Recursively build the tree structure"""
-    if current_depth >= max_depth or url in visited:
-        return
-    
-    visited.add(url)
-    
-    page_info = site_map.pages.get(url, {})
-    title = page_info.get('title', url.split('/')[-1] or url)
-    
-    # Add files found on this page
-    files = site_map.files.get(url, [])
-    if files:
-        file_node = parent_node.add(f"📁 Files ({len(files)})")
-        for file_info in files[:5]:  # Show first 5 files
-            file_type = file_info['type'].upper()
-            file_name = file_info['url'].split('/')[-1]
-            file_node.add(f"📄 [{file_type}] {file_name}")
-        if len(files) > 5:
-            file_node.add(f"... and {len(files) - 5} more files")
-    
-    # Add linked pages
-    links = site_map.links.get(url, [])
-    for link_url in links[:10]:  # Limit to first 10 links to avoid clutter
-        if link_url not in visited:
-            link_info = site_map.pages.get(link_url, {})
-            link_title = link_info.get('title', link_url.split('/')[-1] or link_url)
-            link_node = parent_node.add(f"🔗 {link_title}")
-            _build_tree_recursive(link_node, site_map, link_url, visited.copy(), max_depth, current_depth + 1)
+def _build_tree(root_node, site_map: SiteMap, root_url: str, max_depth: int):
+    """Build the tree structure with an explicit stack instead of recursion"""
+    visited = set()
+    stack = deque([(root_node, root_url, 0)])
+
+    while stack:
+        parent_node, url, depth = stack.pop()
+        if depth >= max_depth or url in visited:
+            continue
+
+        visited.add(url)
+
+        # Add files found on this page
+        files = site_map.get_files(url)
+        if files:
+            file_node = parent_node.add(f"📁 Files ({len(files)})")
+            for file_name, file_type in islice(files, 5):  # Show first 5 files
+                file_node.add(f"📄 [{file_type.upper()}] {file_name}")
+            if len(files) > 5:
+                file_node.add(f"... and {len(files) - 5} more files")
+
+        # Add linked pages
+        links = site_map.get_links(url)
+        for link_url in islice(links, 10):  # Limit to first 10 links to avoid clutter
+            if link_url not in visited:
+                link_title = site_map.get_title(link_url) or site_map.get_basename(link_url)
+                link_node = parent_node.add(f"🔗 {link_title}")
+                stack.append((link_node, link_url, depth + 1))
 
 def show_download_progress(total_items: int) -> Progress:
     """
@@ -2,6 +2,10 @@
 Interactive prompts using Rich and Questionary
 """
 
+import atexit
+import functools
+import re
+from itertools import islice
 from pathlib import Path
 from typing import List, Optional
 import questionary
@@ -14,6 +18,28 @@ import threading
 
 console = Console()
 
+# questionary runs validators on every keystroke — precompiled regex
+# matchers read the buffer in one C call with no intermediate strings
+_INT_RE = re.compile(r'^[1-9]\d*$').match
+_FLOAT_RE = re.compile(r'^\d+(?:\.\d+)?$').match
+
+# Long-lived single-worker executor for prompts fired from async contexts;
+# created lazily on the first prompt and reused for the whole session
+_PROMPT_EXECUTOR: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_PROMPT_LOCK = threading.Lock()
+
+def _prompt_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Get the shared prompt executor, creating it on first use"""
+    global _PROMPT_EXECUTOR
+    if _PROMPT_EXECUTOR is None:
+        with _PROMPT_LOCK:
+            if _PROMPT_EXECUTOR is None:
+                _PROMPT_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="prompt"
+                )
+                atexit.register(_PROMPT_EXECUTOR.shutdown, wait=False)
+    return _PROMPT_EXECUTOR
+
 def safe_questionary_ask(question):
     """
     Safely ask questionary questions, handling event loop conflicts
@@ -21,26 +47,20 @@ def safe_questionary_ask(question):
     try:
         # Try to get current loop
         loop = asyncio.get_running_loop()
-        
-        # We're in an async context, run questionary in a separate thread
-        def run_questionary():
-            # Create a new event loop for this thread
-            new_loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(new_loop)
-            try:
-                return question.ask()
-            finally:
-                new_loop.close()
-                asyncio.set_event_loop(None)
-        
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_questionary)
-            return future.result()
-            
     except RuntimeError:
         # No running event loop, safe to use questionary directly
         return question.ask()
 
+    # We're in an async context: run questionary on the shared worker
+    # thread. prompt_toolkit manages its own loop there, so no per-call
+    # event-loop creation or thread spawn is needed.
+    return _prompt_executor().submit(question.ask).result()
+
+@functools.lru_cache(maxsize=32)
+def _resolve_directory(directory: str) -> Path:
+    """Resolve a user-entered directory once — resolve() stats the filesystem"""
+    return Path(directory).expanduser().resolve()
+
 def get_save_directory() -> str:
     """
     Prompt user for save directory with validation
@@ -53,7 +73,7 @@ def get_save_directory() -> str:
             default="./scraped_content"
         )
         
-        path = Path(directory).expanduser().resolve()
+        path = _resolve_directory(directory)
         
         # Check if directory exists or can be created
         try:
@@ -92,7 +112,7 @@ def show_crawl_options() -> dict:
     options['max_depth'] = safe_questionary_ask(questionary.text(
         "Maximum crawl depth (how many levels deep to go):",
         default="3",
-        validate=lambda x: x.isdigit() and int(x) > 0
+        validate=lambda x: bool(_INT_RE(x))
     ))
     options['max_depth'] = int(options['max_depth'])
     
@@ -100,7 +120,7 @@ def show_crawl_options() -> dict:
     options['delay'] = safe_questionary_ask(questionary.text(
         "Delay between requests (seconds):",
         default="1.0",
-        validate=lambda x: x.replace('.', '').isdigit()
+        validate=lambda x: bool(_FLOAT_RE(x))
     ))
     options['delay'] = float(options['delay'])
     
@@ -154,13 +174,15 @@ def select_paths_to_process(discovered_paths: List[str]) -> List[str]:
         return []
     
     console.print(Panel(f"🔍 [bold]Discovered {len(discovered_paths)} paths[/bold]", style="blue"))
-    
-    # Show preview of paths
-    for i, path in enumerate(discovered_paths[:10]):  # Show first 10
-        console.print(f"  {i+1}. {path}")
-    
+
+    # Show preview of paths as a single render instead of one print per line
+    preview = "\n".join(
+        f"  {i+1}. {path}"
+        for i, path in enumerate(islice(discovered_paths, 10))  # Show first 10
+    )
     if len(discovered_paths) > 10:
-        console.print(f"  ... and {len(discovered_paths) - 10} more")
+        preview += f"\n  ... and {len(discovered_paths) - 10} more"
+    console.print(preview)
     
     # Selection options
     choice = safe_questionary_ask(questionary.select(
@@ -178,9 +200,28 @@ def select_paths_to_process(discovered_paths: List[str]) -> List[str]:
     elif choice == "Process first 10 paths only":
         return discovered_paths[:10]
     elif choice == "Select specific paths":
+        # questionary re-renders every choice on each keystroke (O(N) per
+        # key), so filter first and cap what reaches the checkbox
+        pattern_text = safe_questionary_ask(questionary.text(
+            "Filter paths (regex, blank for all):"
+        ))
+        subset = discovered_paths
+        if pattern_text:
+            try:
+                pattern = re.compile(pattern_text)
+            except re.error as e:
+                console.print(f"❌ [red]Invalid filter pattern: {e}[/red]")
+                return []
+            subset = [path for path in discovered_paths if pattern.search(path)]
+        if not subset:
+            console.print("❌ No paths matched that filter")
+            return []
+        if len(subset) > 200:
+            console.print(f"⚠️  Showing the first 200 of {len(subset)} matching paths")
+            subset = subset[:200]
         return safe_questionary_ask(questionary.checkbox(
             "Select paths to process:",
-            choices=discovered_paths
+            choices=subset
         ))
     else:
         return []
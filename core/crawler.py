@@ -3,18 +3,62 @@ Web crawler for discovering site structure and links
 """
 
 import asyncio
+import functools
+import json
+import re
 import aiohttp
+from pathlib import Path
 from urllib.parse import urljoin, urlparse
 from typing import Set, List, Dict, Optional
+from collections import namedtuple
 from dataclasses import dataclass
 from bs4 import BeautifulSoup
 import time
 from loguru import logger
 
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+    BS4_PARSER = 'lxml'
+except ImportError:
+    LXML_AVAILABLE = False
+    BS4_PARSER = 'html.parser'
+
 # SiteMap will be imported from display module when needed
 from utils.config import Config
 
-@dataclass
+def _main_domain(netloc: str) -> str:
+    """Extract the main domain (e.g. example.com from www.example.com)"""
+    parts = netloc.split('.')
+    if len(parts) >= 2:
+        return '.'.join(parts[-2:])
+    return netloc
+
+# Hrefs that can never become crawlable URLs — fragments, script/mail/tel
+# pseudo-schemes, data URIs and empty strings — matched in one C call
+_SKIP_HREF = re.compile(r'^(?:#|javascript:|mailto:|tel:|data:|$)', re.I).match
+
+# Pre-lowered parse of a URL shared by every predicate that needs it
+UrlInfo = namedtuple('UrlInfo', 'scheme netloc path main_domain')
+
+@functools.lru_cache(maxsize=65536)
+def _urlinfo(url: str) -> UrlInfo:
+    """
+    Parse and lowercase a URL once — menu/footer URLs repeat across
+    hundreds of pages in a crawl, so validity, domain and extension
+    checks all read from this cached struct instead of re-parsing
+    """
+    parsed = urlparse(url)
+    netloc = parsed.netloc.lower()
+    return UrlInfo(parsed.scheme, netloc, parsed.path.lower(), _main_domain(netloc))
+
+@dataclass(slots=True)
 class CrawlResult:
     """Result of a crawl operation"""
     url: str
@@ -35,35 +79,97 @@ class WebCrawler:
         self.session: Optional[aiohttp.ClientSession] = None
         self.visited_urls: Set[str] = set()
         self.discovered_files: Set[str] = set()
+
+        # url -> {etag, last_modified, title, links, files}; loaded lazily,
+        # lets re-crawls answer unchanged pages from a ~200-byte 304
+        self._http_cache: Optional[Dict[str, dict]] = None
         
         # File extensions we want to download
         self.downloadable_extensions = {
             '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
             '.txt', '.rtf', '.odt', '.ods', '.odp', '.csv'
         }
+        # Tuple form for str.endswith — one C call per candidate URL
+        self._downloadable_suffixes = tuple(self.downloadable_extensions)
+        # Extension -> file-type label, one dict hit instead of slicing
+        # the dot off on every classified file
+        self._extension_to_type = {ext: ext[1:] for ext in self.downloadable_extensions}
         
         # Headers to mimic a real browser
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            # br requires the brotli package; aiohttp decodes it in C
+            'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
     
     async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            headers=self.headers,
-            timeout=aiohttp.ClientTimeout(total=30)
-        )
+        """Async context manager entry — the session is created lazily"""
         return self
-    
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
+        """
+        Async context manager exit. The session is deliberately kept open
+        so keep-alive connections and TLS state survive across repeated
+        discovery calls; call aclose() to release it.
+        """
+        return None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared ClientSession, creating it on first use"""
+        if self.session is None or self.session.closed:
+            # Size the pool to the concurrency actually used so workers
+            # never queue behind the connector, and cache DNS so repeated
+            # same-host fetches skip the resolver round-trip
+            connector = aiohttp.TCPConnector(
+                limit=max(100, self.config.max_concurrent_requests * 2),
+                limit_per_host=self.config.max_concurrent_requests,
+                ttl_dns_cache=300,
+                use_dns_cache=True,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=connector
+            )
+        return self.session
+
+    async def aclose(self):
+        """Close the shared session and its connection pool"""
+        if self.session and not self.session.closed:
             await self.session.close()
+        self.session = None
+        self._save_http_cache()
+
+    def _http_cache_path(self) -> Path:
+        """Location of the persisted conditional-GET cache"""
+        return self.config.output_dir / '.http_cache.json'
+
+    def _get_http_cache(self) -> Dict[str, dict]:
+        """Return the conditional-GET cache, loading it on first use"""
+        if self._http_cache is None:
+            try:
+                with open(self._http_cache_path(), 'r') as f:
+                    self._http_cache = json.load(f)
+            except Exception:
+                self._http_cache = {}
+        return self._http_cache
+
+    def _save_http_cache(self):
+        """Persist the conditional-GET cache for the next run"""
+        if not self._http_cache:
+            return
+        try:
+            self.config.output_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._http_cache_path(), 'w') as f:
+                json.dump(self._http_cache, f)
+        except Exception as e:
+            logger.debug(f"Could not persist HTTP cache: {e}")
     
     async def discover_site_structure(self, root_url: str):
         """
@@ -74,70 +180,80 @@ class WebCrawler:
         # Import SiteMap here to avoid circular imports
         from cli.display import SiteMap
         site_map = SiteMap(root_url)
-        
+
         async with self:
-            # Start crawling from the root
-            await self._crawl_recursive(root_url, site_map, depth=0)
-        
-        logger.info(f"Site discovery completed. Found {len(site_map.pages)} pages")
+            # BFS over a shared queue consumed by a fixed worker pool; the
+            # pool size is the concurrency cap, so there are no per-level
+            # semaphores and task count stays O(pool) instead of O(tree).
+            # The queue must stay unbounded: workers are both the only
+            # producers and the only consumers, so a full bounded queue
+            # would block every worker in put() with nobody left to get()
+            # (deadlock). The visited-set dedup already bounds the
+            # frontier to unique URLs.
+            queue = asyncio.Queue()
+            self.visited_urls.add(root_url)
+            queue.put_nowait((root_url, 0))
+
+            workers = [
+                asyncio.create_task(self._worker(queue, site_map))
+                for _ in range(self.config.max_concurrent_requests)
+            ]
+            await queue.join()
+            # Queue is empty after join; sentinels stop the workers cleanly
+            for _ in workers:
+                queue.put_nowait(None)
+            await asyncio.gather(*workers)
+
+        logger.info(f"Site discovery completed. Found {site_map.get_stats()['pages']} pages")
         return site_map
-    
-    async def _crawl_recursive(self, url: str, site_map, depth: int):
+
+    async def _worker(self, queue: asyncio.Queue, site_map):
         """
-        Recursively crawl a website
+        Consume (url, depth) items from the crawl queue until a sentinel
+        """
+        while True:
+            item = await queue.get()
+            if item is None:
+                queue.task_done()
+                return
+            url, depth = item
+            try:
+                await self._process_page(url, depth, site_map, queue)
+            except Exception as e:
+                logger.error(f"Error crawling {url}: {e}")
+            finally:
+                queue.task_done()
+
+    async def _process_page(self, url: str, depth: int, site_map, queue: asyncio.Queue):
+        """
+        Crawl one page and enqueue its same-domain links
         """
-        # Check depth limit
-        if depth > self.config.max_depth:
-            return
-        
-        # Check if already visited
-        if url in self.visited_urls:
-            return
-        
-        # Mark as visited
-        self.visited_urls.add(url)
-        
         # Add delay to be respectful
         if depth > 0:  # No delay for the first request
             await asyncio.sleep(self.config.crawl_delay)
-        
-        try:
-            # Crawl the current page
-            result = await self._crawl_single_page(url, depth)
-            
-            if result.success:
-                # Add page to site map
-                site_map.add_page(result.url, result.title, depth)
-                
-                # Add discovered files
-                for file_info in result.files:
-                    site_map.add_file(result.url, file_info['url'], file_info['type'])
-                
-                # Process links for next level crawling
-                if depth < self.config.max_depth:
-                    tasks = []
-                    for link_url in result.links[:self.config.max_links_per_page]:
-                        site_map.add_link(result.url, link_url)
-                        
-                        # Only crawl if it's within the same domain (optional)
-                        if self._is_same_domain(url, link_url):
-                            task = self._crawl_recursive(link_url, site_map, depth + 1)
-                            tasks.append(task)
-                    
-                    # Execute crawling tasks concurrently (but limited)
-                    if tasks:
-                        # Limit concurrent requests to avoid overwhelming the server
-                        semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
-                        limited_tasks = [self._limited_crawl(semaphore, task) for task in tasks]
-                        await asyncio.gather(*limited_tasks, return_exceptions=True)
-            
-        except Exception as e:
-            logger.error(f"Error crawling {url}: {e}")
-    
-    async def _limited_crawl(self, semaphore: asyncio.Semaphore, task):
-        """Execute crawl task with semaphore limiting"""
-        async with semaphore:
-            return await task
+
+        result = await self._crawl_single_page(url, depth)
+        if not result.success:
+            return
+
+        # Add page to site map
+        site_map.add_page(result.url, result.title, depth)
+
+        # Add discovered files
+        for file_info in result.files:
+            site_map.add_file(result.url, file_info['url'], file_info['type'])
+
+        # Enqueue links for the next level (already deduplicated and
+        # same-domain filtered during extraction)
+        if depth < self.config.max_depth:
+            for link_url in result.links[:self.config.max_links_per_page]:
+                site_map.add_link(result.url, link_url)
+
+                # Check-and-add visited before enqueue so no URL is
+                # fetched twice even with many workers
+                if link_url not in self.visited_urls:
+                    self.visited_urls.add(link_url)
+                    queue.put_nowait((link_url, depth + 1))
     
     async def _crawl_single_page(self, url: str, depth: int) -> CrawlResult:
         """
@@ -145,27 +261,80 @@ class WebCrawler:
         """
         try:
             logger.debug(f"Crawling: {url} (depth: {depth})")
-            
-            async with self.session.get(url) as response:
+
+            # Revalidate instead of refetching when we've seen this page
+            cached = self._get_http_cache().get(url)
+            conditional_headers = {}
+            if cached:
+                if cached.get('etag'):
+                    conditional_headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    conditional_headers['If-Modified-Since'] = cached['last_modified']
+
+            session = await self._get_session()
+            async with session.get(url, headers=conditional_headers or None) as response:
+                if response.status == 304 and cached:
+                    # Unchanged since last crawl: skip body read and parse
+                    logger.debug(f"Not modified, using cached result: {url}")
+                    return CrawlResult(
+                        url=url, title=cached.get('title', ''),
+                        links=cached.get('links', []), files=cached.get('files', []),
+                        depth=depth, success=True
+                    )
+
                 if response.status != 200:
                     return CrawlResult(
                         url=url, title="", links=[], files=[], depth=depth,
                         success=False, error=f"HTTP {response.status}"
                     )
-                
-                content = await response.text()
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                # Extract page title
-                title_tag = soup.find('title')
-                title = title_tag.get_text().strip() if title_tag else url.split('/')[-1]
-                
-                # Extract all links
-                links = self._extract_links(soup, url)
-                
-                # Extract downloadable files
-                files = self._extract_files(soup, url)
-                
+
+                # Don't download bodies that aren't HTML — a link to a big
+                # zip/pdf would otherwise be fully transferred and parsed
+                content_type = response.headers.get('Content-Type', '').lower()
+                if content_type and 'html' not in content_type and 'xhtml' not in content_type:
+                    files = []
+                    file_ext = self._match_file_ext(url)
+                    if file_ext:
+                        files.append({
+                            'url': url,
+                            'type': self._extension_to_type[file_ext],
+                            'text': 'Direct file link'
+                        })
+                    response.release()
+                    return CrawlResult(
+                        url=url, title="", links=[], files=files,
+                        depth=depth, success=True
+                    )
+
+                # Bound per-page memory
+                content_length = response.headers.get('Content-Length', '')
+                if content_length.isdigit() and int(content_length) > self.config.max_html_bytes:
+                    logger.debug(f"Skipping oversized page ({content_length} bytes): {url}")
+                    response.release()
+                    return CrawlResult(
+                        url=url, title="", links=[], files=[], depth=depth,
+                        success=False, error=f"Content-Length {content_length} exceeds max_html_bytes"
+                    )
+
+                if LXML_AVAILABLE:
+                    # Parse incrementally while the body is still arriving
+                    title, links, files = await self._extract_streaming(response, url)
+                else:
+                    content = await response.text()
+                    title, links, files = self._extract_content(content, url)
+
+                # Remember validators so the next run can send a conditional GET
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                if etag or last_modified:
+                    self._get_http_cache()[url] = {
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'title': title,
+                        'links': links,
+                        'files': files
+                    }
+
                 return CrawlResult(
                     url=url, title=title, links=links, files=files,
                     depth=depth, success=True
@@ -178,118 +347,188 @@ class WebCrawler:
                 success=False, error=str(e)
             )
     
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
+    async def _extract_streaming(self, response: aiohttp.ClientResponse, base_url: str):
         """
-        Extract all valid links from a page
+        Feed body chunks into lxml's pull parser as they arrive, so parse
+        CPU overlaps the TCP receive windows instead of waiting for the
+        last byte, and the full decoded document is never materialized
         """
-        links = []
-        
-        # Find all anchor tags with href
-        for link_tag in soup.find_all('a', href=True):
-            href = link_tag['href'].strip()
-            
-            # Skip empty hrefs, anchors, and javascript
-            if not href or href.startswith('#') or href.startswith('javascript:'):
-                continue
-            
-            # Convert relative URLs to absolute
-            absolute_url = urljoin(base_url, href)
-            
-            # Basic URL validation
-            if self._is_valid_url(absolute_url):
-                links.append(absolute_url)
-        
-        # Remove duplicates while preserving order
-        return list(dict.fromkeys(links))
-    
-    def _extract_files(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
+        base_info = _urlinfo(base_url)
+        current_domain = base_info.main_domain if self.config.allow_subdomains else base_info.netloc
+
+        links: List[str] = []
+        files: List[Dict[str, str]] = []
+        seen: set = set()
+        title_parts: List[str] = []
+
+        def handle(elem):
+            tag = elem.tag
+            if tag == 'a':
+                href = (elem.get('href') or '').strip()
+                self._classify_anchor(href, (elem.text or '').strip(), base_url,
+                                      current_domain, links, files, seen)
+            elif tag == 'iframe':
+                self._classify_embed((elem.get('src') or '').strip(), base_url, files)
+            elif tag == 'title' and not title_parts:
+                title_parts.append((elem.text or '').strip())
+            elem.clear()
+
+        parser = etree.HTMLPullParser(events=('end',), encoding=response.charset)
+
+        async for chunk in response.content.iter_chunked(16384):
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                handle(elem)
+
+        # Flush whatever the parser is still buffering
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        for _, elem in parser.read_events():
+            handle(elem)
+
+        title = title_parts[0] if title_parts else base_url.split('/')[-1]
+        return title, links, files
+
+    def _extract_content(self, content: str, base_url: str):
         """
-        Extract downloadable files from a page
+        Extract title, links and downloadable files from a page in one
+        pass, using selectolax's C parser when available. Links are
+        deduplicated and same-domain filtered here so cross-domain URLs
+        never travel upstream just to be discarded.
         """
-        files = []
-        
-        # Check all links for downloadable files
+        base_info = _urlinfo(base_url)
+        current_domain = base_info.main_domain if self.config.allow_subdomains else base_info.netloc
+
+        if SELECTOLAX_AVAILABLE:
+            return self._extract_with_selectolax(content, base_url, current_domain)
+        return self._extract_with_bs4(content, base_url, current_domain)
+
+    def _extract_with_selectolax(self, content: str, base_url: str, current_domain: str):
+        """
+        Single-pass extraction backed by selectolax (lexbor C core)
+        """
+        tree = HTMLParser(content)
+
+        title_node = tree.css_first('title')
+        title = title_node.text().strip() if title_node else base_url.split('/')[-1]
+
+        links: List[str] = []
+        files: List[Dict[str, str]] = []
+        seen: set = set()
+
+        for node in tree.css('a[href]'):
+            href = (node.attributes.get('href') or '').strip()
+            self._classify_anchor(href, node.text(deep=True).strip(), base_url,
+                                  current_domain, links, files, seen)
+
+        # Also check for embedded files (like PDFs in iframes)
+        for node in tree.css('iframe[src]'):
+            src = (node.attributes.get('src') or '').strip()
+            self._classify_embed(src, base_url, files)
+
+        return title, links, files
+
+    def _extract_with_bs4(self, content: str, base_url: str, current_domain: str):
+        """
+        Single-pass extraction fallback using BeautifulSoup
+        """
+        soup = BeautifulSoup(content, BS4_PARSER)
+
+        title_tag = soup.find('title')
+        title = title_tag.get_text().strip() if title_tag else base_url.split('/')[-1]
+
+        links: List[str] = []
+        files: List[Dict[str, str]] = []
+        seen: set = set()
+
         for link_tag in soup.find_all('a', href=True):
-            href = link_tag['href'].strip()
-            if not href:
-                continue
-            
-            absolute_url = urljoin(base_url, href)
-            
-            # Check if it's a downloadable file
-            file_ext = self._get_file_extension(absolute_url)
-            if file_ext in self.downloadable_extensions:
-                files.append({
-                    'url': absolute_url,
-                    'type': file_ext[1:],  # Remove the dot
-                    'text': link_tag.get_text().strip()
-                })
-        
+            self._classify_anchor(link_tag['href'].strip(), link_tag.get_text().strip(),
+                                  base_url, current_domain, links, files, seen)
+
         # Also check for embedded files (like PDFs in iframes)
         for iframe in soup.find_all('iframe', src=True):
-            src = iframe['src'].strip()
-            if src:
-                absolute_url = urljoin(base_url, src)
-                file_ext = self._get_file_extension(absolute_url)
-                if file_ext in self.downloadable_extensions:
-                    files.append({
-                        'url': absolute_url,
-                        'type': file_ext[1:],
-                        'text': 'Embedded file'
-                    })
-        
-        return files
+            self._classify_embed(iframe['src'].strip(), base_url, files)
+
+        return title, links, files
+
+    def _classify_anchor(self, href: str, link_text: str, base_url: str, current_domain: str,
+                         links: List[str], files: List[Dict[str, str]], seen: set):
+        """
+        Classify one anchor as crawlable link and/or downloadable file
+        """
+        # Skip empty hrefs, anchors, and pseudo-scheme links
+        if _SKIP_HREF(href):
+            return
+
+        # Convert relative URLs to absolute
+        absolute_url = urljoin(base_url, href)
+
+        # Check if it's a downloadable file (files may live off-domain)
+        file_ext = self._match_file_ext(absolute_url)
+        if file_ext:
+            files.append({
+                'url': absolute_url,
+                'type': self._extension_to_type[file_ext],
+                'text': link_text
+            })
+
+        # Validate, dedupe and domain-filter inline — one pass, no
+        # dict.fromkeys rebuild afterwards
+        if (absolute_url not in seen
+                and self._is_valid_url(absolute_url)
+                and self._is_on_domain(current_domain, absolute_url)):
+            seen.add(absolute_url)
+            links.append(absolute_url)
+
+    def _classify_embed(self, src: str, base_url: str, files: List[Dict[str, str]]):
+        """
+        Record an embedded resource (iframe src) if it's a downloadable file
+        """
+        if not src:
+            return
+        absolute_url = urljoin(base_url, src)
+        file_ext = self._match_file_ext(absolute_url)
+        if file_ext:
+            files.append({
+                'url': absolute_url,
+                'type': self._extension_to_type[file_ext],
+                'text': 'Embedded file'
+            })
     
     def _is_valid_url(self, url: str) -> bool:
         """
         Check if a URL is valid for crawling
         """
         try:
-            parsed = urlparse(url)
-            return parsed.scheme in ('http', 'https') and parsed.netloc
+            info = _urlinfo(url)
+            return info.scheme in ('http', 'https') and bool(info.netloc)
         except:
             return False
-    
-    def _is_same_domain(self, url1: str, url2: str) -> bool:
+
+    def _is_on_domain(self, current_domain: str, link_url: str) -> bool:
         """
-        Check if two URLs are from the same domain
+        Check if a link is on the (pre-parsed) current page's domain
         """
         try:
-            domain1 = urlparse(url1).netloc.lower()
-            domain2 = urlparse(url2).netloc.lower()
-            
-            # Allow subdomains if configured
-            if self.config.allow_subdomains:
-                # Extract main domain (e.g., example.com from www.example.com)
-                def get_main_domain(domain):
-                    parts = domain.split('.')
-                    if len(parts) >= 2:
-                        return '.'.join(parts[-2:])
-                    return domain
-                
-                return get_main_domain(domain1) == get_main_domain(domain2)
-            else:
-                return domain1 == domain2
+            info = _urlinfo(link_url)
         except:
             return False
+
+        # Allow subdomains if configured
+        if self.config.allow_subdomains:
+            return info.main_domain == current_domain
+        return info.netloc == current_domain
     
-    def _get_file_extension(self, url: str) -> str:
+    def _match_file_ext(self, url: str) -> Optional[str]:
         """
-        Get file extension from URL
+        Return the matching downloadable extension for a URL, if any
         """
-        try:
-            parsed = urlparse(url)
-            path = parsed.path.lower()
-            
-            # Remove query parameters and fragments
-            if '?' in path:
-                path = path.split('?')[0]
-            if '#' in path:
-                path = path.split('#')[0]
-            
-            # Get extension
-            if '.' in path:
-                return '.' + path.split('.')[-1]
-            return ''
-        except:
-            return ''
+        # The only question is "does the path end in a known suffix?", so
+        # strip query/fragment and use endswith — no urlparse needed
+        path = url.split('?', 1)[0].split('#', 1)[0].lower()
+        for ext in self._downloadable_suffixes:
+            if path.endswith(ext):
+                return ext
+        return None
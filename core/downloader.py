@@ -3,6 +3,10 @@ File downloader for various document formats
 """
 
 import asyncio
+import functools
+import json
+import os
+import re
 import aiohttp
 import aiofiles
 from pathlib import Path
@@ -12,17 +16,69 @@ import mimetypes
 from bs4 import BeautifulSoup
 from loguru import logger
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import lxml  # noqa: F401 — C-backed parser for BeautifulSoup
+    BS4_PARSER = 'lxml'
+except ImportError:
+    BS4_PARSER = 'html.parser'
+
 from utils.config import Config
 
+# Nav links and repeated hrefs recur across pages within a crawl, so
+# memoize the parse instead of re-splitting the same URL each time
+_cached_urlparse = functools.lru_cache(maxsize=4096)(urlparse)
+
 class FileDownloader:
     """
     Downloads files of supported formats from web pages
     """
-    
-    def __init__(self, config: Config):
+
+    # Files at least this large are fetched as parallel Range segments
+    RANGE_THRESHOLD = 4 * 1024 * 1024
+
+    # Every element that can carry a downloadable URL, in one selector
+    FILE_CANDIDATE_SELECTOR = 'a[href], iframe[src], object[src], embed[src], [data-url]'
+
+    # One translate() pass replaces eight per-character replace() loops
+    _INVALID_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+    def __init__(self, config: Config, session: Optional[aiohttp.ClientSession] = None):
         self.config = config
-        self.session: Optional[aiohttp.ClientSession] = None
+        # An injected session is owned by the caller and shared across the
+        # whole crawl, so its connection pool and keep-alives are reused
+        # instead of paying TCP+TLS setup per page
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self.downloaded_files: Set[str] = set()
+
+        # Condition-guarded counter instead of a Semaphore so the
+        # concurrency limit can be resized safely mid-crawl (e.g. backing
+        # off after 429s); a Semaphore's _value is not mutable API
+        self._active_downloads = 0
+        self._download_cond: Optional[asyncio.Condition] = None
+
+        # Download metadata is appended to one shared JSONL log by a
+        # background writer, instead of a .meta file per download
+        self._metadata_queue: Optional[asyncio.Queue] = None
+        self._metadata_task: Optional[asyncio.Task] = None
+
+        # Directory listing cache: one scandir per output directory
+        # replaces a blocking stat per candidate file
+        self._dir_cache: Dict[Path, set] = {}
+
+        # (url, extension) -> generated filename; the same file URL shows
+        # up on many pages within a crawl
+        self._filename_cache: Dict[tuple, str] = {}
+
+        # Large files need more than a page-fetch budget; applied
+        # per-request so a shared session's defaults are untouched
+        self._download_timeout = aiohttp.ClientTimeout(total=300)
         
         # Supported file extensions and their MIME types
         self.supported_extensions = {
@@ -57,133 +113,219 @@ class FileDownloader:
             '.svg': 'image/svg+xml'
         }
         
-        # Headers to mimic a real browser
+        # Compiled once: a single C regex scan replaces the per-indicator
+        # substring loop over path and link text in _analyze_url
+        self._doc_indicator_search = re.compile(
+            r'download|file|document|attachment|export'
+        ).search
+
+        # Headers to mimic a real browser. Accept-Encoding is left to
+        # aiohttp, whose default advertises br too when brotli is
+        # installed and decodes everything transparently in C
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': '*/*',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         }
     
     async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            headers=self.headers,
-            timeout=aiohttp.ClientTimeout(total=300)  # 5 minutes for large files
-        )
+        """Async context manager entry — creates a session only if none was injected"""
+        if self.session is None or self.session.closed:
+            # A Condition binds to the loop it first waits on; a new
+            # session can mean a new loop (the CLI runs each invocation
+            # on a fresh Runner loop), so start with a fresh one
+            self._download_cond = None
+            # Explicit connector: cache DNS and cap per-host connections so
+            # many-host crawls neither thrash the resolver nor pile every
+            # download onto one origin
+            connector = aiohttp.TCPConnector(
+                limit=self.config.max_concurrent_downloads * 2,
+                limit_per_host=max(8, self.config.max_concurrent_downloads),
+                ttl_dns_cache=300,
+                use_dns_cache=True,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=300)  # 5 minutes for large files
+            )
+            self._owns_session = True
         return self
-    
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
+        """Async context manager exit — injected sessions are left open for their owner"""
+        await self.flush_metadata()
+        if self.session and self._owns_session:
             await self.session.close()
+
+    def adopt_session(self, session: aiohttp.ClientSession):
+        """Share an externally-owned session; the caller is responsible for closing it"""
+        self.session = session
+        self._owns_session = False
+        # Same loop-binding caveat as __aenter__: the adopted session
+        # belongs to the caller's current loop, so the concurrency
+        # Condition from any earlier loop must not be reused
+        self._download_cond = None
     
     async def download_files_from_html(self, html_content: str, base_url: str) -> int:
         """
-        Extract and download all supported files from HTML content
+        Extract and download all supported files from HTML content.
+        Callers that already hold a parsed tree should use
+        download_files_from_tree / download_files_from_soup to avoid
+        paying for a second parse of the same document.
+        """
+        if SELECTOLAX_AVAILABLE:
+            # Lexbor walks the document in C and we only need attribute
+            # values, so skip BeautifulSoup's Python object model entirely
+            return await self.download_files_from_tree(LexborHTMLParser(html_content), base_url)
+
+        soup = BeautifulSoup(html_content, BS4_PARSER)
+        return await self.download_files_from_soup(soup, base_url)
+
+    async def download_files_from_tree(self, tree, base_url: str) -> int:
+        """
+        Extract and download files from an already-parsed selectolax tree
+        """
+        file_urls = self._extract_file_urls_selectolax(tree, base_url)
+        return await self._download_file_batch(file_urls, base_url)
+
+    async def download_files_from_soup(self, soup: BeautifulSoup, base_url: str) -> int:
+        """
+        Extract and download files from an already-parsed BeautifulSoup
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
         file_urls = self._extract_file_urls(soup, base_url)
-        
+        return await self._download_file_batch(file_urls, base_url)
+
+    async def _download_file_batch(self, file_urls: List[Dict[str, str]], base_url: str) -> int:
+        """
+        Download extracted candidates concurrently and count successes
+        """
         if not file_urls:
             return 0
-        
+
         logger.info(f"Found {len(file_urls)} downloadable files on {base_url}")
-        
+
         # Download files concurrently (but limited)
-        semaphore = asyncio.Semaphore(self.config.max_concurrent_downloads)
         tasks = []
-        
+
         for file_info in file_urls:
             if file_info['url'] not in self.downloaded_files:
-                task = self._download_single_file(semaphore, file_info, base_url)
+                task = self._download_single_file(file_info, base_url)
                 tasks.append(task)
-        
+
         results = await asyncio.gather(*tasks, return_exceptions=True)
-        
+
         # Count successful downloads
         successful_downloads = sum(1 for result in results if result is True)
-        
+
         return successful_downloads
-    
+
+    def _extract_file_urls_selectolax(self, tree, base_url: str) -> List[Dict[str, str]]:
+        """
+        Extract all downloadable file URLs from a Lexbor-parsed tree
+        """
+        file_urls = []
+        seen_urls = set()
+
+        # One DOM traversal covers anchors, embedded content and data-url
+        # attributes; dispatch per node instead of walking the tree thrice
+        for node in tree.css(self.FILE_CANDIDATE_SELECTOR):
+            attrs = node.attributes
+            tag = node.tag
+
+            if tag == 'a':
+                href = (attrs.get('href') or '').strip()
+                if href:
+                    self._append_candidate(file_urls, seen_urls, base_url, href, node.text(deep=True).strip())
+            elif tag in ('iframe', 'object', 'embed'):
+                src = (attrs.get('src') or '').strip()
+                if src:
+                    self._append_candidate(file_urls, seen_urls, base_url, src, 'Embedded content')
+
+            data_url = (attrs.get('data-url') or '').strip()
+            if data_url:
+                self._append_candidate(file_urls, seen_urls, base_url, data_url, node.text(deep=True).strip())
+
+        return file_urls
+
+    def _append_candidate(self, file_urls: List[Dict[str, str]], seen_urls: set,
+                          base_url: str, raw_url: str, link_text: str):
+        """
+        Resolve a candidate href/src against the base URL and record it
+        if it analyzes as a downloadable file. Dedup happens here, before
+        analysis, so repeated hrefs and already-downloaded URLs never pay
+        for urlparse and extension matching.
+        """
+        absolute_url = urljoin(base_url, raw_url)
+        if absolute_url in seen_urls or absolute_url in self.downloaded_files:
+            return
+        seen_urls.add(absolute_url)
+
+        file_info = self._analyze_url(absolute_url, link_text)
+
+        if file_info:
+            file_urls.append(file_info)
+
     def _extract_file_urls(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
         """
         Extract all downloadable file URLs from HTML
         """
         file_urls = []
-        
-        # Check all anchor tags
-        for link in soup.find_all('a', href=True):
-            href = link['href'].strip()
-            if not href:
-                continue
-            
-            absolute_url = urljoin(base_url, href)
-            file_info = self._analyze_url(absolute_url, link.get_text().strip())
-            
-            if file_info:
-                file_urls.append(file_info)
-        
-        # Check embedded content (iframes, objects, embeds)
-        for tag in soup.find_all(['iframe', 'object', 'embed'], src=True):
-            src = tag['src'].strip()
-            if not src:
-                continue
-            
-            absolute_url = urljoin(base_url, src)
-            file_info = self._analyze_url(absolute_url, 'Embedded content')
-            
-            if file_info:
-                file_urls.append(file_info)
-        
-        # Check for data attributes that might contain file URLs
-        for element in soup.find_all(attrs={'data-url': True}):
-            data_url = element['data-url'].strip()
-            if data_url:
-                absolute_url = urljoin(base_url, data_url)
-                file_info = self._analyze_url(absolute_url, element.get_text().strip())
-                
-                if file_info:
-                    file_urls.append(file_info)
-        
-        # Remove duplicates
         seen_urls = set()
-        unique_files = []
-        for file_info in file_urls:
-            if file_info['url'] not in seen_urls:
-                seen_urls.add(file_info['url'])
-                unique_files.append(file_info)
-        
-        return unique_files
+
+        # Same fused traversal as the selectolax path: one select() pass
+        # over all candidate elements instead of three find_all scans
+        for element in soup.select(self.FILE_CANDIDATE_SELECTOR):
+            name = element.name
+
+            if name == 'a':
+                href = (element.get('href') or '').strip()
+                if href:
+                    self._append_candidate(file_urls, seen_urls, base_url, href, element.get_text().strip())
+            elif name in ('iframe', 'object', 'embed'):
+                src = (element.get('src') or '').strip()
+                if src:
+                    self._append_candidate(file_urls, seen_urls, base_url, src, 'Embedded content')
+
+            data_url = (element.get('data-url') or '').strip()
+            if data_url:
+                self._append_candidate(file_urls, seen_urls, base_url, data_url, element.get_text().strip())
+
+        return file_urls
     
     def _analyze_url(self, url: str, link_text: str) -> Optional[Dict[str, str]]:
         """
         Analyze a URL to determine if it's a downloadable file
         """
         try:
-            parsed = urlparse(url)
+            parsed = _cached_urlparse(url)
             path = parsed.path.lower()
-            
-            # Remove query parameters for extension detection
-            clean_path = path.split('?')[0].split('#')[0]
-            
-            # Check file extension
-            for ext in self.supported_extensions:
-                if clean_path.endswith(ext):
-                    return {
-                        'url': url,
-                        'extension': ext,
-                        'mime_type': self.supported_extensions[ext],
-                        'link_text': link_text,
-                        'filename': self._extract_filename(url, ext)
-                    }
-            
+
+            # Remove query parameters for extension detection; partition
+            # avoids building throwaway lists
+            clean_path = path.partition('?')[0].partition('#')[0]
+
+            # Check file extension — one dict hit instead of scanning
+            # every supported suffix per URL
+            ext = os.path.splitext(clean_path)[1]
+            mime_type = self.supported_extensions.get(ext)
+            if mime_type:
+                return {
+                    'url': url,
+                    'extension': ext,
+                    'mime_type': mime_type,
+                    'link_text': link_text,
+                    'filename': self._extract_filename(url, ext)
+                }
+
             # Check for common document indicators in URL or link text
-            doc_indicators = ['download', 'file', 'document', 'attachment', 'export']
-            if any(indicator in path.lower() or indicator in link_text.lower() for indicator in doc_indicators):
+            # (path is already lowercased; lowercase the text once)
+            lt_lower = link_text.lower()
+            if self._doc_indicator_search(path) or self._doc_indicator_search(lt_lower):
                 # Might be a document, try to determine type from other clues
-                if any(word in link_text.lower() for word in ['pdf', 'document']):
+                if 'pdf' in lt_lower or 'document' in lt_lower:
                     return {
                         'url': url,
                         'extension': '.pdf',
@@ -195,17 +337,27 @@ class FileDownloader:
             return None
             
         except Exception as e:
-            logger.debug(f"Error analyzing URL {url}: {e}")
+            logger.debug("Error analyzing URL {}: {}", url, e)
             return None
     
     def _extract_filename(self, url: str, extension: str) -> str:
+        """
+        Extract or generate a filename from URL, memoized per (url, ext)
+        """
+        key = (url, extension)
+        cached = self._filename_cache.get(key)
+        if cached is None:
+            cached = self._filename_cache[key] = self._build_filename(url, extension)
+        return cached
+
+    def _build_filename(self, url: str, extension: str) -> str:
         """
         Extract or generate a filename from URL
         """
         try:
-            parsed = urlparse(url)
+            parsed = _cached_urlparse(url)
             path = parsed.path
-            
+
             # Try to get filename from path
             if path and '/' in path:
                 filename = path.split('/')[-1]
@@ -222,10 +374,8 @@ class FileDownloader:
                 filename = domain
             
             # Clean filename
-            invalid_chars = '<>:"/\\|?*'
-            for char in invalid_chars:
-                filename = filename.replace(char, '_')
-            
+            filename = filename.translate(self._INVALID_TRANS)
+
             # Limit length
             if len(filename) > 100:
                 filename = filename[:100]
@@ -242,109 +392,354 @@ class FileDownloader:
             timestamp = int(time.time())
             return f"file_{timestamp}{extension}"
     
-    async def _download_single_file(self, semaphore: asyncio.Semaphore, file_info: Dict[str, str], source_url: str) -> bool:
+    def _get_download_cond(self) -> asyncio.Condition:
+        """Return the concurrency condition, creating it on first use"""
+        if self._download_cond is None:
+            self._download_cond = asyncio.Condition()
+        return self._download_cond
+
+    def set_concurrency(self, limit: int):
+        """
+        Resize the download concurrency limit at runtime. Waiting tasks
+        re-check the new limit immediately.
+        """
+        self.config.max_concurrent_downloads = limit
+        cond = self._download_cond
+        if cond is not None:
+            # Wake everyone so waiters re-evaluate against the new limit
+            async def _notify():
+                async with cond:
+                    cond.notify_all()
+            asyncio.ensure_future(_notify())
+
+    async def _download_single_file(self, file_info: Dict[str, str], source_url: str) -> bool:
+        """
+        Download a single file under the (resizable) concurrency limit
+        """
+        cond = self._get_download_cond()
+        async with cond:
+            await cond.wait_for(
+                lambda: self._active_downloads < self.config.max_concurrent_downloads
+            )
+            self._active_downloads += 1
+        try:
+            return await self._download_file_inner(file_info, source_url)
+        finally:
+            async with cond:
+                self._active_downloads -= 1
+                cond.notify(1)
+
+    async def _download_file_inner(self, file_info: Dict[str, str], source_url: str,
+                                   allow_ranged: bool = True) -> bool:
         """
         Download a single file
         """
-        async with semaphore:
-            try:
-                url = file_info['url']
-                filename = file_info['filename']
-                
-                # Skip if already downloaded
-                if url in self.downloaded_files:
-                    return True
-                
-                logger.debug(f"Downloading: {filename} from {url}")
-                
-                # Create output directory
-                file_type = file_info['extension'][1:]  # Remove dot
-                output_dir = self.config.output_dir / 'files' / file_type
-                output_dir.mkdir(parents=True, exist_ok=True)
-                
-                output_path = output_dir / filename
-                
-                # Skip if file already exists
-                if output_path.exists():
-                    logger.debug(f"File already exists: {filename}")
-                    self.downloaded_files.add(url)
-                    return True
-                
-                # Download the file
-                async with self.session.get(url) as response:
-                    if response.status != 200:
-                        logger.warning(f"HTTP {response.status} for {url}")
-                        return False
-                    
-                    # Check content type
-                    content_type = response.headers.get('content-type', '').lower()
-                    expected_mime = file_info['mime_type'].lower()
-                    
-                    # Some flexibility in MIME type checking
-                    if not (expected_mime in content_type or content_type in expected_mime or 'application/octet-stream' in content_type):
-                        logger.debug(f"MIME type mismatch for {url}: expected {expected_mime}, got {content_type}")
-                    
-                    # Save file
-                    async with aiofiles.open(output_path, 'wb') as f:
-                        async for chunk in response.content.iter_chunked(8192):
-                            await f.write(chunk)
-                
-                # Verify file was downloaded
-                if output_path.exists() and output_path.stat().st_size > 0:
-                    self.downloaded_files.add(url)
-                    logger.info(f"✅ Downloaded: {filename} ({output_path.stat().st_size} bytes)")
-                    
-                    # Save metadata
-                    await self._save_file_metadata(output_path, file_info, source_url)
-                    
-                    return True
+        try:
+            url = file_info['url']
+            filename = file_info['filename']
+            
+            # Skip if already downloaded
+            if url in self.downloaded_files:
+                return True
+            
+            logger.debug("Downloading: {} from {}", filename, url)
+            
+            # Create output directory
+            file_type = file_info['extension'][1:]  # Remove dot
+            output_dir = self.config.output_dir / 'files' / file_type
+            output_dir.mkdir(parents=True, exist_ok=True)
+            
+            output_path = output_dir / filename
+
+            # Skip if file already exists — answered from the cached
+            # directory listing, no per-file stat
+            dir_names = self._dir_names(output_dir)
+            if filename in dir_names:
+                logger.debug("File already exists: {}", filename)
+                self.downloaded_files.add(url)
+                return True
+
+            # Resume an interrupted transfer from its .part file; the
+            # prefix already on disk is never re-transferred
+            part_path = output_path.with_suffix(output_path.suffix + '.part')
+            resume_from = part_path.stat().st_size if part_path.exists() else 0
+
+            # File bodies are stored verbatim, so ask for the raw
+            # representation: a gzip/br-transcoded body would make our
+            # byte count disagree with Content-Length and poison both the
+            # size verification and the .part resume offsets
+            req_headers = {'Accept-Encoding': 'identity'}
+            if resume_from:
+                req_headers['Range'] = f'bytes={resume_from}-'
+
+            # Download the file
+            async with self.session.get(url, headers=req_headers, timeout=self._download_timeout) as response:
+                if response.status == 206 and resume_from:
+                    mode = 'ab'  # server honored the range; append the rest
+                elif response.status == 200:
+                    mode = 'wb'  # full body (or the server ignored the range)
+                    resume_from = 0
                 else:
-                    logger.warning(f"❌ Download failed or empty file: {filename}")
+                    logger.warning(f"HTTP {response.status} for {url}")
                     return False
-                
-            except Exception as e:
-                logger.error(f"Error downloading {file_info.get('url', 'unknown')}: {e}")
+
+                # Check content type
+                content_type = response.headers.get('content-type', '').lower()
+                expected_mime = file_info['mime_type'].lower()
+
+                # Some flexibility in MIME type checking
+                if not (expected_mime in content_type or content_type in expected_mime or 'application/octet-stream' in content_type):
+                    logger.debug("MIME type mismatch for {}: expected {}, got {}", url, expected_mime, content_type)
+
+                content_length = response.headers.get('Content-Length', '')
+                expected_size = resume_from + int(content_length) if content_length.isdigit() else None
+
+                # Some servers transcode anyway; Content-Length then
+                # counts encoded bytes while we write decoded ones, so
+                # the size check would reject every complete download
+                content_encoding = response.headers.get('Content-Encoding', '').lower()
+                if content_encoding and content_encoding != 'identity':
+                    expected_size = None
+                    if mode == 'ab':
+                        # Range offsets counted encoded bytes but the
+                        # .part holds decoded ones — restart cleanly
+                        response.close()
+                        part_path.unlink(missing_ok=True)
+                        return await self._download_file_inner(file_info, source_url, allow_ranged=False)
+
+                # Reject oversized files before a byte hits the disk
+                if expected_size and expected_size > self.config.max_file_size:
+                    logger.warning(f"Skipping oversized file ({expected_size} bytes): {url}")
+                    return False
+
+                # Large files on range-capable servers: abandon this
+                # stream and refetch as parallel segments so a single TCP
+                # flow's window doesn't cap speed. Gated on this GET's own
+                # headers, so small files never pay an extra round trip.
+                if (allow_ranged and mode == 'wb' and expected_size
+                        and expected_size >= self.RANGE_THRESHOLD
+                        and response.headers.get('Accept-Ranges', '').lower() == 'bytes'):
+                    response.close()
+                    if await self._download_ranged(url, output_path, part_path, expected_size):
+                        self.downloaded_files.add(url)
+                        dir_names.add(filename)
+                        logger.info("✅ Downloaded (ranged): {} ({} bytes)", filename, expected_size)
+                        await self._save_file_metadata(output_path, file_info, source_url,
+                                                       file_size=expected_size)
+                        return True
+                    # Segment failure already cleaned up its partial;
+                    # retry once over the plain single-GET path
+                    return await self._download_file_inner(file_info, source_url, allow_ranged=False)
+
+                # Save file, counting bytes as they stream so the verify
+                # step below doesn't need to stat the result. readany()
+                # hands back the transport's buffer as-is, skipping
+                # iter_chunked's re-slicing copy per chunk
+                written = resume_from
+                async with aiofiles.open(part_path, mode) as f:
+                    while True:
+                        chunk = await response.content.readany()
+                        if not chunk:
+                            break
+                        await f.write(chunk)
+                        written += len(chunk)
+
+            # Promote the .part file only once the size checks out, so
+            # an interrupted run leaves a resumable partial behind
+            if expected_size is not None and written != expected_size:
+                logger.warning(f"Incomplete download ({written}/{expected_size} bytes), keeping partial: {filename}")
+                return False
+
+            # Verify file was downloaded
+            if written > 0:
+                part_path.rename(output_path)
+                self.downloaded_files.add(url)
+                dir_names.add(filename)
+                logger.info("✅ Downloaded: {} ({} bytes)", filename, written)
+
+                # Save metadata
+                await self._save_file_metadata(output_path, file_info, source_url, file_size=written)
+
+                return True
+            else:
+                logger.warning(f"❌ Download failed or empty file: {filename}")
                 return False
+            
+        except Exception as e:
+            logger.error(f"Error downloading {file_info.get('url', 'unknown')}: {e}")
+            return False
     
-    async def _save_file_metadata(self, file_path: Path, file_info: Dict[str, str], source_url: str):
+    async def _download_ranged(self, url: str, output_path: Path, part_path: Path,
+                               total_size: int) -> Optional[bool]:
+        """
+        Download a large file as concurrent HTTP Range segments. The
+        caller supplies the size and has already confirmed range support,
+        so no probe request is made here. Returns True on success, or
+        None when a segment fails — callers then fall back to the plain
+        single-GET path.
+        """
+        try:
+            segments = max(1, self.config.range_segments)
+            segment_size = -(-total_size // segments)  # ceil division
+
+            # Preallocate the .part file so each segment can write at its
+            # own offset; only a verified transfer is promoted to the
+            # final name, so a crash can't leave a full-size corrupt file
+            # that later runs would treat as already downloaded
+            with open(part_path, 'wb') as f:
+                f.truncate(total_size)
+
+            async def fetch_segment(start: int, end: int):
+                # identity keeps segment offsets and byte counts in raw
+                # bytes, matching the preallocated file
+                headers = {'Range': f'bytes={start}-{end}', 'Accept-Encoding': 'identity'}
+                async with self.session.get(url, headers=headers, timeout=self._download_timeout) as response:
+                    if response.status != 206:
+                        raise RuntimeError(f"Expected 206 for range request, got {response.status}")
+                    written = 0
+                    async with aiofiles.open(part_path, 'r+b') as f:
+                        await f.seek(start)
+                        async for chunk in response.content.iter_chunked(self.config.download_chunk_size):
+                            await f.write(chunk)
+                            written += len(chunk)
+                    if written != end - start + 1:
+                        raise RuntimeError(f"Short range segment: {written}/{end - start + 1} bytes")
+
+            tasks = [
+                fetch_segment(start, min(start + segment_size, total_size) - 1)
+                for start in range(0, total_size, segment_size)
+            ]
+            await asyncio.gather(*tasks)
+
+            part_path.rename(output_path)
+            return True
+
+        except Exception as e:
+            logger.debug(f"Ranged download failed for {url}, falling back to single GET: {e}")
+            # A segmented partial has holes, so it can't seed a resume
+            part_path.unlink(missing_ok=True)
+            return None
+
+    def _dir_names(self, directory: Path) -> set:
         """
-        Save metadata about the downloaded file
+        Names present in an output directory, listed once via scandir
+        and kept current as downloads complete
+        """
+        names = self._dir_cache.get(directory)
+        if names is None:
+            try:
+                names = {entry.name for entry in os.scandir(directory)}
+            except FileNotFoundError:
+                names = set()
+            self._dir_cache[directory] = names
+        return names
+
+    async def _save_file_metadata(self, file_path: Path, file_info: Dict[str, str], source_url: str,
+                                  file_size: Optional[int] = None):
+        """
+        Queue metadata about the downloaded file for the JSONL log
         """
         try:
             metadata = {
+                'file_name': file_path.name,
                 'original_url': file_info['url'],
                 'source_page': source_url,
                 'link_text': file_info['link_text'],
                 'file_type': file_info['extension'],
                 'mime_type': file_info['mime_type'],
                 'download_time': str(asyncio.get_event_loop().time()),
-                'file_size': file_path.stat().st_size
+                'file_size': file_size if file_size is not None else file_path.stat().st_size
             }
-            
-            metadata_path = file_path.with_suffix(file_path.suffix + '.meta')
-            
-            async with aiofiles.open(metadata_path, 'w', encoding='utf-8') as f:
-                import json
-                await f.write(json.dumps(metadata, indent=2))
-                
+
+            if self._metadata_queue is None:
+                self._metadata_queue = asyncio.Queue()
+            if self._metadata_task is None or self._metadata_task.done():
+                self._metadata_task = asyncio.create_task(self._metadata_writer())
+
+            await self._metadata_queue.put(metadata)
+
         except Exception as e:
             logger.debug(f"Could not save metadata for {file_path}: {e}")
+
+    async def _metadata_writer(self):
+        """
+        Background task: drain queued metadata in batches and append them
+        to files/_metadata.jsonl — one open/write per batch instead of a
+        separate .meta file (open + write + close) per download
+        """
+        metadata_path = self.config.output_dir / 'files' / '_metadata.jsonl'
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = [await self._metadata_queue.get()]
+            # Everything after the first get() runs under one try/finally
+            # so every dequeued item is task_done()'d even when batch
+            # collection itself raises (including cancellation) —
+            # otherwise flush_metadata's join() would block forever
+            try:
+                deadline = loop.time() + 1.0
+                while len(batch) < 100:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._metadata_queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                try:
+                    metadata_path.parent.mkdir(parents=True, exist_ok=True)
+                    async with aiofiles.open(metadata_path, 'a', encoding='utf-8') as f:
+                        await f.write(''.join(
+                            json.dumps(m, separators=(',', ':')) + '\n' for m in batch
+                        ))
+                except Exception as e:
+                    logger.debug(f"Could not write metadata batch: {e}")
+            finally:
+                for _ in batch:
+                    self._metadata_queue.task_done()
+
+    async def flush_metadata(self):
+        """Write any queued metadata and stop the background writer"""
+        if self._metadata_queue is not None:
+            await self._metadata_queue.join()
+        if self._metadata_task is not None:
+            self._metadata_task.cancel()
+            try:
+                await self._metadata_task
+            except asyncio.CancelledError:
+                pass
+            self._metadata_task = None
+        # Drop the queue too: it binds to the loop the writer first
+        # waited on, and this downloader can outlive that loop (the CLI
+        # runs each invocation on a fresh Runner loop while the component
+        # cache keeps the instance). The next run lazily creates a fresh,
+        # loop-local queue.
+        self._metadata_queue = None
     
     async def download_direct_url(self, url: str, output_path: Path) -> bool:
         """
         Download a file directly from a URL
         """
         try:
-            async with self.session.get(url) as response:
+            async with self.session.get(url, headers={'Accept-Encoding': 'identity'},
+                                        timeout=self._download_timeout) as response:
                 if response.status != 200:
                     return False
-                
+
+                content_length = response.content_length
+                if content_length and content_length > self.config.max_file_size:
+                    logger.warning(f"Skipping oversized file ({content_length} bytes): {url}")
+                    return False
+
                 # Ensure output directory exists
                 output_path.parent.mkdir(parents=True, exist_ok=True)
                 
                 # Download file
                 async with aiofiles.open(output_path, 'wb') as f:
-                    async for chunk in response.content.iter_chunked(8192):
+                    while True:
+                        chunk = await response.content.readany()
+                        if not chunk:
+                            break
                         await f.write(chunk)
                 
                 return output_path.exists() and output_path.stat().st_size > 0
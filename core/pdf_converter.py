@@ -3,6 +3,7 @@ PDF conversion functionality using multiple backends
 """
 
 import asyncio
+import concurrent.futures
 import subprocess
 from pathlib import Path
 from typing import Optional, Union
@@ -30,6 +31,25 @@ except ImportError:
 
 from utils.config import Config
 
+# Worker functions run in ProcessPoolExecutor children, so they must be
+# module-level (picklable) and import their backend locally
+
+def _weasyprint_url_worker(url: str, output_path: str):
+    import weasyprint
+    weasyprint.HTML(url=url).write_pdf(output_path)
+
+def _weasyprint_html_worker(html_content: str, output_path: str, base_url: Optional[str]):
+    import weasyprint
+    weasyprint.HTML(string=html_content, base_url=base_url).write_pdf(output_path)
+
+def _pdfkit_url_worker(url: str, output_path: str, options: dict):
+    import pdfkit
+    pdfkit.from_url(url, output_path, options=options)
+
+def _pdfkit_html_worker(html_content: str, output_path: str, options: dict):
+    import pdfkit
+    pdfkit.from_string(html_content, output_path, options=options)
+
 class PDFConverter:
     """
     PDF converter with multiple backend support
@@ -38,6 +58,21 @@ class PDFConverter:
     def __init__(self, config: Config):
         self.config = config
         self.preferred_backend = self._detect_best_backend()
+
+        # One Playwright driver + Chromium process reused across all
+        # conversions; launching a browser per PDF costs seconds each
+        self._pw = None
+        self._browser = None
+
+        # WeasyPrint and pdfkit are GIL-bound Python/synchronous work —
+        # a process pool gives real core parallelism and keeps the event
+        # loop's default thread pool free for I/O
+        self._cpu_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+        # Remembered after the first successful Chrome-fallback launch so
+        # later conversions don't retry executables that don't exist
+        self._chrome_executable: Optional[str] = None
+
         logger.info(f"PDF Converter initialized with backend: {self.preferred_backend}")
     
     def _detect_best_backend(self) -> str:
@@ -53,6 +88,40 @@ class PDFConverter:
         else:
             return 'chrome'  # Fallback to Chrome headless
     
+    async def _ensure_browser(self):
+        """Lazily start Playwright and launch one shared headless Chromium"""
+        if self._browser is None or not self._browser.is_connected():
+            if self._pw is None:
+                self._pw = await async_playwright().start()
+            self._browser = await self._pw.chromium.launch(headless=True)
+        return self._browser
+
+    def _get_cpu_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Return the CPU-bound conversion pool, creating it on first use"""
+        if self._cpu_pool is None:
+            self._cpu_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.config.pdf_workers
+            )
+        return self._cpu_pool
+
+    async def close(self):
+        """Release the shared browser, Playwright driver and worker pool"""
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(wait=False)
+            self._cpu_pool = None
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+            self._pw = None
+
     async def convert_url_to_pdf(self, url: str, output_path: Path) -> bool:
         """
         Convert a URL to PDF using the best available method
@@ -93,19 +162,20 @@ class PDFConverter:
         Convert URL to PDF using Playwright
         """
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                
-                # Set viewport and user agent
-                await page.set_viewport_size({"width": 1920, "height": 1080})
-                await page.set_extra_http_headers({
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                
+            browser = await self._ensure_browser()
+
+            # A fresh context per conversion keeps cookies/state isolated
+            # while reusing the already-running browser process
+            context = await browser.new_context(
+                viewport={"width": 1920, "height": 1080},
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            )
+            try:
+                page = await context.new_page()
+
                 # Navigate to page
                 await page.goto(url, wait_until='networkidle', timeout=30000)
-                
+
                 # Generate PDF
                 await page.pdf(
                     path=str(output_path),
@@ -118,10 +188,10 @@ class PDFConverter:
                         'left': '1cm'
                     }
                 )
-                
-                await browser.close()
-                return True
-                
+            finally:
+                await context.close()
+            return True
+
         except Exception as e:
             logger.error(f"Playwright conversion failed for {url}: {e}")
             return False
@@ -131,13 +201,14 @@ class PDFConverter:
         Convert HTML content to PDF using Playwright
         """
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                
+            browser = await self._ensure_browser()
+            context = await browser.new_context()
+            try:
+                page = await context.new_page()
+
                 # Set content
                 await page.set_content(html_content, wait_until='networkidle')
-                
+
                 # Generate PDF
                 await page.pdf(
                     path=str(output_path),
@@ -150,10 +221,10 @@ class PDFConverter:
                         'left': '1cm'
                     }
                 )
-                
-                await browser.close()
-                return True
-                
+            finally:
+                await context.close()
+            return True
+
         except Exception as e:
             logger.error(f"Playwright HTML conversion failed: {e}")
             return False
@@ -163,11 +234,11 @@ class PDFConverter:
         Convert URL to PDF using WeasyPrint
         """
         try:
-            # WeasyPrint is synchronous, so run in thread pool
+            # WeasyPrint is CPU-bound Python, so run in the process pool
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
-                None,
-                lambda: weasyprint.HTML(url=url).write_pdf(str(output_path))
+                self._get_cpu_pool(),
+                _weasyprint_url_worker, url, str(output_path)
             )
             return True
         except Exception as e:
@@ -181,8 +252,8 @@ class PDFConverter:
         try:
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
-                None,
-                lambda: weasyprint.HTML(string=html_content, base_url=base_url).write_pdf(str(output_path))
+                self._get_cpu_pool(),
+                _weasyprint_html_worker, html_content, str(output_path), base_url
             )
             return True
         except Exception as e:
@@ -207,8 +278,8 @@ class PDFConverter:
             
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
-                None,
-                lambda: pdfkit.from_url(url, str(output_path), options=options)
+                self._get_cpu_pool(),
+                _pdfkit_url_worker, url, str(output_path), options
             )
             return True
         except Exception as e:
@@ -232,8 +303,8 @@ class PDFConverter:
             
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
-                None,
-                lambda: pdfkit.from_string(html_content, str(output_path), options=options)
+                self._get_cpu_pool(),
+                _pdfkit_html_worker, html_content, str(output_path), options
             )
             return True
         except Exception as e:
@@ -256,9 +327,13 @@ class PDFConverter:
                 url
             ]
             
-            # Try different Chrome executable names
-            chrome_executables = ['google-chrome', 'chromium-browser', 'chromium', 'chrome']
-            
+            # Try different Chrome executable names; once one launches it
+            # is remembered so later conversions skip the probing
+            if self._chrome_executable:
+                chrome_executables = [self._chrome_executable]
+            else:
+                chrome_executables = ['google-chrome', 'chromium-browser', 'chromium', 'chrome']
+
             for executable in chrome_executables:
                 try:
                     cmd[0] = executable
@@ -267,18 +342,23 @@ class PDFConverter:
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.PIPE
                     )
-                    
+
                     stdout, stderr = await process.communicate()
-                    
+                    self._chrome_executable = executable
+
                     if process.returncode == 0 and output_path.exists():
                         return True
                     else:
                         logger.debug(f"Chrome ({executable}) failed: {stderr.decode()}")
-                        
+
                 except FileNotFoundError:
                     continue
-            
-            logger.error("No Chrome executable found for PDF conversion")
+
+            logger.error(
+                "No Chrome executable found for PDF conversion — "
+                "install Playwright (pip install playwright && playwright install chromium) "
+                "for a persistent, much faster backend"
+            )
             return False
             
         except Exception as e:
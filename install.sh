@@ -15,7 +15,13 @@ echo "📁 WebScraper directory: $WEBSCRAPER_DIR"
 # Check if Python 3 is available
 if ! command -v python3 &> /dev/null; then
     echo "❌ Python 3 is required but not installed."
-    echo "   Please install Python 3.8 or higher and try again."
+    echo "   Please install Python 3.11 or higher and try again."
+    exit 1
+fi
+
+# The async core uses TaskGroup/except*, which need Python 3.11+
+if ! python3 -c 'import sys; sys.exit(0 if sys.version_info >= (3, 11) else 1)'; then
+    echo "❌ Python 3.11 or higher is required (found $(python3 --version))."
     exit 1
 fi
 
@@ -91,6 +91,55 @@ def test_webscraper_import():
         import traceback
         traceback.print_exc()
 
+def test_component_reuse_across_loops():
+    """
+    Regression test: the CLI's component cache keeps FileDownloader /
+    WebScraper instances alive across invocations, but every invocation
+    runs on a fresh event loop. Loop-bound asyncio primitives (the
+    download Condition, the metadata queue) must be reset between runs
+    or the second invocation hangs/fails.
+    """
+    console.print("\n🔁 [bold blue]Testing component reuse across event loops[/bold blue]")
+
+    try:
+        import tempfile
+        from core.downloader import FileDownloader
+        from utils.config import Config
+
+        config = Config(output_dir=Path(tempfile.mkdtemp()))
+        downloader = FileDownloader(config)
+
+        async def one_run():
+            # The scraper adopts its (re)created session at the start of
+            # each run, which must also reset the loop-bound Condition
+            downloader.adopt_session(None)
+            cond = downloader._get_download_cond()
+            async with cond:
+                cond.notify_all()
+
+            # Queue one metadata record and flush, as a real run would
+            await downloader._save_file_metadata(
+                config.output_dir / 'files' / 'sample.pdf',
+                {'url': 'http://example.com/sample.pdf', 'extension': '.pdf',
+                 'mime_type': 'application/pdf', 'link_text': 'sample'},
+                'http://example.com/',
+                file_size=1
+            )
+            await downloader.flush_metadata()
+
+        # Two invocations, two fresh loops, one cached component
+        with asyncio.Runner() as runner:
+            runner.run(one_run())
+        with asyncio.Runner() as runner:
+            runner.run(one_run())
+
+        console.print("   ✅ Cached components survived a second event loop")
+
+    except Exception as e:
+        console.print(f"   ❌ Component reuse test failed: {e}")
+        import traceback
+        traceback.print_exc()
+
 if __name__ == "__main__":
     console.print("🔬 [bold green]Async Environment Diagnostics[/bold green]")
     console.print(f"Python version: {sys.version}")
@@ -98,5 +147,6 @@ if __name__ == "__main__":
     
     test_asyncio_environments()
     test_webscraper_import()
+    test_component_reuse_across_loops()
     
     console.print("\n🎉 [bold green]Diagnostics complete![/bold green]")
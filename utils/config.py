@@ -2,11 +2,58 @@
 Configuration management for the web scraper
 """
 
+import functools
+import os
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional, List
 from pydantic import BaseModel, field_validator, Field
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+
+    def _json_dump_bytes(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+else:
+    _json_loads = json.loads
+
+    def _json_dump_bytes(data) -> bytes:
+        return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+# Built once at import: get_user_agent/get_request_headers are called on
+# every component construction and always return the same values
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+_DEFAULT_HEADERS = MappingProxyType({
+    'User-Agent': _USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+})
+
+_DEFAULT_EXTENSIONS = (
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.txt', '.rtf', '.csv', '.odt', '.ods', '.odp'
+)
+
+# Leaf directories only — makedirs creates the output dir and files/
+# as parents, so the whole layout needs one call per entry
+_OUTPUT_SUBDIRS = (
+    'pages',        # PDF pages
+    'html',         # Raw HTML (optional)
+    'logs',         # Log files
+    'files/pdf', 'files/doc', 'files/xls', 'files/ppt', 'files/txt', 'files/other',
+)
+
 class Config(BaseModel):
     """
     Configuration settings for the web scraper
@@ -20,17 +67,21 @@ class Config(BaseModel):
     max_links_per_page: int = 50
     max_concurrent_requests: int = 5
     max_concurrent_downloads: int = 3
+    range_segments: int = 4  # parallel segments for large-file downloads
+    download_chunk_size: int = 131072  # streaming read size in bytes
+    max_file_size: int = 100 * 1024 * 1024  # reject downloads larger than this
     crawl_delay: float = 1.0  # seconds between requests
+    max_html_bytes: int = 5_000_000  # skip pages larger than this
+    connect_timeout: float = 10.0  # per-request connect budget in seconds
+    sock_read_timeout: float = 20.0  # max gap between body chunks in seconds
+    request_timeout: float = 60.0  # overall per-request ceiling in seconds
     
     # Domain settings
     allow_subdomains: bool = True
     respect_robots_txt: bool = True
     
     # File settings
-    supported_extensions: List[str] = Field(default_factory=lambda: [
-        '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
-        '.txt', '.rtf', '.csv', '.odt', '.ods', '.odp'
-    ])
+    supported_extensions: List[str] = Field(default_factory=lambda: list(_DEFAULT_EXTENSIONS))
     
     # UI settings
     interactive: bool = True
@@ -39,8 +90,11 @@ class Config(BaseModel):
     # PDF conversion settings
     pdf_format: str = 'A4'
     pdf_margin: str = '1cm'
+    pdf_workers: int = 2  # process-pool size for CPU-bound PDF backends
     
-    model_config = {"arbitrary_types_allowed": True}
+    # defer_build postpones the core-schema/validator build from class
+    # definition (i.e. import time) to the first actual validation
+    model_config = {"arbitrary_types_allowed": True, "defer_build": True}
     
     @field_validator('output_dir', mode='before')
     @classmethod
@@ -76,10 +130,10 @@ class Config(BaseModel):
             config_data = self.model_dump()
             # Convert Path to string for JSON serialization
             config_data['output_dir'] = str(config_data['output_dir'])
-            
-            with open(config_path, 'w') as f:
-                json.dump(config_data, f, indent=2)
-                
+
+            with open(config_path, 'wb') as f:
+                f.write(_json_dump_bytes(config_data))
+
         except Exception as e:
             raise ValueError(f"Could not save config to {config_path}: {e}")
     
@@ -87,46 +141,47 @@ class Config(BaseModel):
     def load_from_file(cls, config_path: Path) -> 'Config':
         """Load configuration from a JSON file"""
         try:
-            with open(config_path, 'r') as f:
-                config_data = json.load(f)
-            
+            with open(config_path, 'rb') as f:
+                config_data = _json_loads(f.read())
+
             return cls(**config_data)
-            
+
         except Exception as e:
             raise ValueError(f"Could not load config from {config_path}: {e}")
+
+    @classmethod
+    def load_trusted(cls, config_path: Path) -> 'Config':
+        """
+        Load a config file we wrote ourselves, skipping validation.
+        save_to_file already emitted validated data, so re-running the
+        field validators on read-back is pure overhead; user-supplied
+        paths should keep going through load_from_file.
+        """
+        with open(config_path, 'rb') as f:
+            config_data = _json_loads(f.read())
+
+        config_data['output_dir'] = Path(config_data['output_dir'])
+        return cls.model_construct(**config_data)
     
     def get_user_agent(self) -> str:
         """Get user agent string"""
-        return 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    
+        return _USER_AGENT
+
     def get_request_headers(self) -> dict:
-        """Get default request headers"""
-        return {
-            'User-Agent': self.get_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+        """
+        Get default request headers. The returned mapping is shared and
+        read-only; callers that need to mutate should take a dict() copy.
+        """
+        return _DEFAULT_HEADERS
     
     def create_output_structure(self):
         """Create the output directory structure"""
         try:
-            # Main output directory
-            self.output_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Subdirectories
-            (self.output_dir / 'pages').mkdir(exist_ok=True)  # PDF pages
-            (self.output_dir / 'files').mkdir(exist_ok=True)  # Downloaded files
-            (self.output_dir / 'html').mkdir(exist_ok=True)   # Raw HTML (optional)
-            (self.output_dir / 'logs').mkdir(exist_ok=True)   # Log files
-            
-            # Create subdirectories for different file types
-            file_types = ['pdf', 'doc', 'xls', 'ppt', 'txt', 'other']
-            for file_type in file_types:
-                (self.output_dir / 'files' / file_type).mkdir(exist_ok=True)
-                
+            # One makedirs per leaf; the main output dir and files/ are
+            # created implicitly as parents instead of via separate calls
+            for subdir in _OUTPUT_SUBDIRS:
+                os.makedirs(self.output_dir / subdir, exist_ok=True)
+
         except Exception as e:
             raise ValueError(f"Could not create output structure: {e}")
     
@@ -148,6 +203,10 @@ class ConfigManager:
     """
     
     DEFAULT_CONFIG_NAME = 'webscraper_config.json'
+
+    # path -> (mtime_ns, size, Config); config files are single-writer,
+    # so an unchanged stat means the parsed result is still valid
+    _cache: dict = {}
     
     @staticmethod
     def get_default_config_path() -> Path:
@@ -159,9 +218,17 @@ class ConfigManager:
         return config_dir / ConfigManager.DEFAULT_CONFIG_NAME
     
     @staticmethod
-    def create_default_config(output_dir: Path) -> Config:
-        """Create a default configuration"""
+    @functools.lru_cache(maxsize=32)
+    def _default_config_base(output_dir: Path) -> Config:
+        """Memoized default Config per output_dir; callers must copy"""
         return Config(output_dir=output_dir)
+
+    @staticmethod
+    def create_default_config(output_dir: Path) -> Config:
+        """Create a default configuration (validated once per output_dir)"""
+        # The memoized instance is shared across calls, so hand out a
+        # copy — callers mutate their Config freely
+        return ConfigManager._default_config_base(output_dir).model_copy()
     
     @staticmethod
     def load_or_create_config(output_dir: Path, config_path: Optional[Path] = None) -> Config:
@@ -169,15 +236,25 @@ class ConfigManager:
         if config_path is None:
             config_path = ConfigManager.get_default_config_path()
         
-        if config_path.exists():
-            try:
-                config = Config.load_from_file(config_path)
-                # Update output directory if provided
-                config.output_dir = output_dir
-                return config
-            except Exception:
-                # If loading fails, create default
-                pass
+        try:
+            # One stat answers both "does it exist" and "has it changed";
+            # a hit skips the read+parse entirely
+            st = os.stat(config_path)
+            cached = ConfigManager._cache.get(config_path)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                # The cached instance is shared between callers; copy
+                # per call so one caller's output_dir (or any later
+                # mutation) can't retarget another's config
+                return cached[2].model_copy(update={'output_dir': output_dir})
+
+            # The default config file was written by save_to_file, so
+            # the fall-through-on-error below makes validation redundant
+            config = Config.load_trusted(config_path)
+            ConfigManager._cache[config_path] = (st.st_mtime_ns, st.st_size, config)
+            return config.model_copy(update={'output_dir': output_dir})
+        except Exception:
+            # Missing file or unloadable content: create default
+            pass
         
         # Create default config
         config = ConfigManager.create_default_config(output_dir)
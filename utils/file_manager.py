@@ -2,14 +2,65 @@
 File management utilities for organizing scraped content
 """
 
+import hashlib
 import json
+import os
 import shutil
+import zipfile
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from loguru import logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+
+    def _json_dump_bytes(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+
+    def _json_dumps_compact(data) -> str:
+        return orjson.dumps(data, default=str).decode('utf-8')
+else:
+    _json_loads = json.loads
+
+    def _json_dump_bytes(data) -> bytes:
+        return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+    def _json_dumps_compact(data) -> str:
+        return json.dumps(data, separators=(',', ':'), default=str)
+
+# file_type -> files/ bucket; anything unknown lands in 'other'
+_EXT_BUCKET = {
+    'pdf': 'pdf',
+    'doc': 'doc', 'docx': 'doc',
+    'xls': 'xls', 'xlsx': 'xls',
+    'ppt': 'ppt', 'pptx': 'ppt',
+    'txt': 'txt', 'rtf': 'txt',
+}
+
+# Leaf directories of the output layout; parents ('files/') come for free
+# via makedirs, so one call per leaf creates the whole tree
+_SUBDIRS = (
+    'pages',           # PDF pages
+    'files/pdf',       # PDF files
+    'files/doc',       # Word documents
+    'files/xls',       # Excel files
+    'files/ppt',       # PowerPoint files
+    'files/txt',       # Text files
+    'files/other',     # Other file types
+    'html',            # Raw HTML (optional)
+    'logs',            # Log files
+    'metadata'         # Metadata files
+)
+
 @dataclass
 class ScrapingSession:
     """Information about a scraping session"""
@@ -35,6 +86,21 @@ class FileManager:
         self.output_dir = Path(output_dir)
         self.session_file = self.output_dir / 'session_info.json'
         self.index_file = self.output_dir / 'content_index.json'
+
+        # target_dir -> st_dev, so organize_file only stats each target
+        # directory once when deciding rename vs copy-across-devices
+        self._dev_cache: Dict[Path, int] = {}
+
+        # Precomputed so organize_file's Path join is one segment
+        self._files_dir = self.output_dir / 'files'
+
+        # Digests of the last-written session/index payloads; periodic
+        # checkpoints that didn't change anything skip the rewrite
+        self._last_session_hash: Optional[bytes] = None
+        self._last_index_hash: Optional[bytes] = None
+
+        # Consolidated per-file metadata store, opened on first use
+        self._meta_db = None
         
     def initialize_session(self, root_url: str) -> ScrapingSession:
         """
@@ -67,47 +133,61 @@ class FileManager:
         session.pages_processed = pages_processed
         session.files_downloaded = files_downloaded
         session.errors = errors
-        
+
+        # Format the timestamps once here; the summary report reuses
+        # these instead of re-running strftime per section
+        session._start_str = session.start_time.strftime('%Y-%m-%d %H:%M:%S') if session.start_time else 'Unknown'
+        session._end_str = session.end_time.strftime('%Y-%m-%d %H:%M:%S')
+        if session.start_time:
+            session._duration_str = str(session.end_time - session.start_time).split('.')[0]
+        else:
+            session._duration_str = 'Unknown'
+
         self._save_session_info(session)
         self._create_summary_report(session)
-        
+
+        # Flush any metadata inserts buffered since the last commit
+        if self._meta_db is not None:
+            self._meta_db.commit()
+
         logger.info(f"Finalized scraping session: {session.session_id}")
     
     def _create_directory_structure(self):
         """
         Create the organized directory structure
         """
-        directories = [
-            'pages',           # PDF pages
-            'files/pdf',       # PDF files
-            'files/doc',       # Word documents
-            'files/xls',       # Excel files
-            'files/ppt',       # PowerPoint files
-            'files/txt',       # Text files
-            'files/other',     # Other file types
-            'html',            # Raw HTML (optional)
-            'logs',            # Log files
-            'metadata'         # Metadata files
-        ]
-        
-        for directory in directories:
-            (self.output_dir / directory).mkdir(parents=True, exist_ok=True)
+        for directory in _SUBDIRS:
+            os.makedirs(self.output_dir / directory, exist_ok=True)
     
     def _save_session_info(self, session: ScrapingSession):
         """
         Save session information to JSON file
         """
         try:
-            session_data = asdict(session)
-            
-            # Convert datetime objects to strings
-            if session_data['start_time']:
-                session_data['start_time'] = session.start_time.isoformat()
-            if session_data['end_time']:
-                session_data['end_time'] = session.end_time.isoformat()
+            # Direct attribute access: asdict() walks the dataclass field
+            # metadata and deep-copies every value (including the whole
+            # errors list) on each checkpoint
+            session_data = {
+                'session_id': session.session_id,
+                'start_time': session.start_time.isoformat() if session.start_time else None,
+                'end_time': session.end_time.isoformat() if session.end_time else None,
+                'root_url': session.root_url,
+                'output_dir': session.output_dir,
+                'pages_processed': session.pages_processed,
+                'files_downloaded': session.files_downloaded,
+                'errors': session.errors,
+            }
             
-            with open(self.session_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
+            # Serialize once, and only touch the file if the payload
+            # actually differs from what's already on disk
+            payload = _json_dump_bytes(session_data)
+            digest = hashlib.blake2b(payload, digest_size=16).digest()
+            if digest == self._last_session_hash:
+                return
+
+            with open(self.session_file, 'wb') as f:
+                f.write(payload)
+            self._last_session_hash = digest
                 
         except Exception as e:
             logger.error(f"Could not save session info: {e}")
@@ -118,19 +198,21 @@ class FileManager:
         """
         try:
             report_path = self.output_dir / 'SUMMARY.md'
-            
-            duration = "Unknown"
-            if session.start_time and session.end_time:
-                delta = session.end_time - session.start_time
-                duration = str(delta).split('.')[0]  # Remove microseconds
-            
-            report_content = f"""# Web Scraping Summary
+
+            # Prefer the strings finalize_session already formatted
+            start_str = getattr(session, '_start_str', 'Unknown')
+            end_str = getattr(session, '_end_str', 'Unknown')
+            duration = getattr(session, '_duration_str', 'Unknown')
+
+            # Collect sections in a list and writelines() them: repeated
+            # += on one string re-copies the whole report every append
+            parts = [f"""# Web Scraping Summary
 
 ## Session Information
 - **Session ID**: {session.session_id}
 - **Root URL**: {session.root_url}
-- **Start Time**: {session.start_time.strftime('%Y-%m-%d %H:%M:%S') if session.start_time else 'Unknown'}
-- **End Time**: {session.end_time.strftime('%Y-%m-%d %H:%M:%S') if session.end_time else 'Unknown'}
+- **Start Time**: {start_str}
+- **End Time**: {end_str}
 - **Duration**: {duration}
 
 ## Results
@@ -155,25 +237,27 @@ class FileManager:
 ```
 
 ## File Counts
-"""
-            
+"""]
+
             # Add file counts by type
             file_counts = self._get_file_counts()
             for file_type, count in file_counts.items():
-                report_content += f"- **{file_type.upper()}**: {count} files\n"
-            
+                parts.append(f"- **{file_type.upper()}**: {count} files\n")
+
             if session.errors:
-                report_content += f"\n## Errors\n"
+                parts.append("\n## Errors\n")
                 for i, error in enumerate(session.errors[:10], 1):  # Show first 10 errors
-                    report_content += f"{i}. {error}\n"
-                
+                    parts.append(f"{i}. {error}\n")
+
                 if len(session.errors) > 10:
-                    report_content += f"... and {len(session.errors) - 10} more errors\n"
-            
-            report_content += f"\n---\n*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n"
-            
+                    parts.append(f"... and {len(session.errors) - 10} more errors\n")
+
+            # The report is generated as the session ends, so the end
+            # timestamp doubles as the generation time
+            parts.append(f"\n---\n*Generated on {end_str}*\n")
+
             with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(report_content)
+                f.writelines(parts)
                 
             logger.info(f"Summary report created: {report_path}")
             
@@ -185,22 +269,31 @@ class FileManager:
         Get counts of files by type
         """
         counts = {}
-        
-        # Count PDF pages
+
+        # Count PDF pages — one scandir pass, no per-entry stat; glob()
+        # would materialize a list and stat every entry
         pages_dir = self.output_dir / 'pages'
-        if pages_dir.exists():
-            counts['pages'] = len(list(pages_dir.glob('*.pdf')))
-        
-        # Count downloaded files by type
+        try:
+            with os.scandir(pages_dir) as entries:
+                counts['pages'] = sum(1 for e in entries if e.name.endswith('.pdf'))
+        except FileNotFoundError:
+            pass
+
+        # Count downloaded files by type, excluding .meta sidecars, in a
+        # single pass per subdirectory
         files_dir = self.output_dir / 'files'
-        if files_dir.exists():
-            for subdir in files_dir.iterdir():
-                if subdir.is_dir():
-                    file_count = len(list(subdir.glob('*')))
-                    # Exclude .meta files from count
-                    meta_count = len(list(subdir.glob('*.meta')))
-                    counts[subdir.name] = file_count - meta_count
-        
+        try:
+            subdirs = [e for e in os.scandir(files_dir) if e.is_dir()]
+        except FileNotFoundError:
+            return counts
+        for subdir in subdirs:
+            count = 0
+            with os.scandir(subdir.path) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.meta') and not entry.name.startswith('.'):
+                        count += 1
+            counts[subdir.name] = count
+
         return counts
     
     def create_content_index(self, pages_info: List[Dict], files_info: List[Dict]):
@@ -208,19 +301,36 @@ class FileManager:
         Create an index of all scraped content
         """
         try:
+            # The caller just handed us every file's metadata — derive the
+            # per-type counts from it rather than re-walking pages/ and
+            # files/*/ on disk; only scan when entries lack a type key
+            if all('file_type' in fi for fi in files_info):
+                file_types = dict(Counter(fi['file_type'] for fi in files_info))
+                file_types['pages'] = len(pages_info)
+            else:
+                file_types = self._get_file_counts()
+
             index_data = {
-                'created': datetime.now().isoformat(),
                 'pages': pages_info,
                 'files': files_info,
                 'statistics': {
                     'total_pages': len(pages_info),
                     'total_files': len(files_info),
-                    'file_types': self._get_file_counts()
+                    'file_types': file_types
                 }
             }
-            
-            with open(self.index_file, 'w') as f:
-                json.dump(index_data, f, indent=2)
+
+            # Hash the stable content (the 'created' timestamp would
+            # otherwise make every checkpoint look new) and skip the
+            # rewrite when nothing changed
+            digest = hashlib.blake2b(_json_dump_bytes(index_data), digest_size=16).digest()
+            if digest == self._last_index_hash:
+                return
+
+            index_data['created'] = datetime.now().isoformat()
+            with open(self.index_file, 'wb') as f:
+                f.write(_json_dump_bytes(index_data))
+            self._last_index_hash = digest
                 
             logger.info(f"Content index created: {self.index_file}")
             
@@ -233,32 +343,32 @@ class FileManager:
         """
         try:
             # Determine target directory
-            if file_type.lower() in ['pdf']:
-                target_dir = self.output_dir / 'files' / 'pdf'
-            elif file_type.lower() in ['doc', 'docx']:
-                target_dir = self.output_dir / 'files' / 'doc'
-            elif file_type.lower() in ['xls', 'xlsx']:
-                target_dir = self.output_dir / 'files' / 'xls'
-            elif file_type.lower() in ['ppt', 'pptx']:
-                target_dir = self.output_dir / 'files' / 'ppt'
-            elif file_type.lower() in ['txt', 'rtf']:
-                target_dir = self.output_dir / 'files' / 'txt'
-            else:
-                target_dir = self.output_dir / 'files' / 'other'
-            
+            target_dir = self._files_dir / _EXT_BUCKET.get(file_type.lower(), 'other')
+
             target_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Generate unique filename if needed
+
+            # Claim a unique target name with O_CREAT|O_EXCL — one syscall
+            # per attempt instead of an lstat probe that can also race with
+            # a concurrent download choosing the same name
+            stem = file_path.stem
+            suffix = file_path.suffix
             target_path = target_dir / file_path.name
             counter = 1
-            while target_path.exists():
-                stem = file_path.stem
-                suffix = file_path.suffix
-                target_path = target_dir / f"{stem}_{counter}{suffix}"
-                counter += 1
-            
-            # Move file
-            shutil.move(str(file_path), str(target_path))
+            while True:
+                try:
+                    os.close(os.open(target_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                    break
+                except FileExistsError:
+                    target_path = target_dir / f"{stem}_{counter}{suffix}"
+                    counter += 1
+
+            # Same filesystem: one rename syscall. shutil.move can fall
+            # back to a full copy2+unlink even for same-device moves.
+            if self._same_device(file_path, target_dir):
+                os.replace(file_path, target_path)
+            else:
+                shutil.copyfile(file_path, target_path)
+                os.unlink(file_path)
             
             # Save metadata if provided
             if metadata:
@@ -271,31 +381,72 @@ class FileManager:
             logger.error(f"Could not organize file {file_path}: {e}")
             return file_path
     
+    def _same_device(self, src: Path, target_dir: Path) -> bool:
+        """Whether src and target_dir sit on the same filesystem"""
+        dev = self._dev_cache.get(target_dir)
+        if dev is None:
+            dev = target_dir.stat().st_dev
+            self._dev_cache[target_dir] = dev
+        return src.stat().st_dev == dev
+
+    def _get_meta_db(self):
+        """Open (once) the consolidated file-metadata database"""
+        if self._meta_db is None:
+            import sqlite3
+
+            db_dir = self.output_dir / 'metadata'
+            db_dir.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(db_dir / 'files.db')
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('CREATE TABLE IF NOT EXISTS meta (path TEXT PRIMARY KEY, json TEXT)')
+            self._meta_db = db
+        return self._meta_db
+
     def _save_file_metadata(self, file_path: Path, metadata: Dict):
         """
-        Save metadata for a file
+        Save metadata for a file. Rows accumulate in one SQLite database
+        (WAL, relaxed fsync) instead of one tiny .meta sidecar per file —
+        a large crawl's worth of create+write+close syscalls becomes a
+        handful of buffered inserts committed at session finalize.
         """
         try:
-            metadata_path = file_path.with_suffix(file_path.suffix + '.meta')
-            
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
-                
+            self._get_meta_db().execute(
+                'INSERT OR REPLACE INTO meta (path, json) VALUES (?, ?)',
+                (str(file_path), _json_dumps_compact(metadata))
+            )
         except Exception as e:
             logger.debug(f"Could not save metadata for {file_path}: {e}")
+
+    def get_file_metadata(self, file_path: Path) -> Optional[Dict]:
+        """Look up previously saved metadata for a file"""
+        try:
+            row = self._get_meta_db().execute(
+                'SELECT json FROM meta WHERE path = ?', (str(file_path),)
+            ).fetchone()
+            return _json_loads(row[0]) if row else None
+        except Exception as e:
+            logger.debug(f"Could not load metadata for {file_path}: {e}")
+            return None
     
     def cleanup_empty_directories(self):
         """
         Remove empty directories from the output structure
         """
         try:
-            for root, dirs, files in self.output_dir.rglob('*'):
-                for directory in dirs:
-                    dir_path = Path(root) / directory
-                    if dir_path.is_dir() and not any(dir_path.iterdir()):
-                        dir_path.rmdir()
-                        logger.debug(f"Removed empty directory: {dir_path}")
-                        
+            # Post-order walk: each directory is listed exactly once, and
+            # children are removed before their parent is considered, so
+            # newly-emptied parents go too. rmdir itself rejects non-empty
+            # directories, which doubles as the emptiness check.
+            for root, dirs, files in os.walk(self.output_dir, topdown=False):
+                if root == str(self.output_dir):
+                    continue
+                try:
+                    os.rmdir(root)
+                    logger.debug("Removed empty directory: {}", root)
+                except OSError:
+                    pass
+
         except Exception as e:
             logger.debug(f"Error during cleanup: {e}")
     
@@ -305,33 +456,41 @@ class FileManager:
         """
         try:
             if self.session_file.exists():
-                with open(self.session_file, 'r') as f:
-                    return json.load(f)
+                with open(self.session_file, 'rb') as f:
+                    return _json_loads(f.read())
             return None
         except Exception as e:
             logger.error(f"Could not load session info: {e}")
             return None
     
-    def archive_session(self, archive_name: Optional[str] = None) -> Path:
+    def archive_session(self, archive_name: Optional[str] = None,
+                        compression: int = zipfile.ZIP_STORED) -> Path:
         """
-        Create a compressed archive of the entire session
+        Create a zip archive of the entire session. Entries are stored
+        uncompressed by default: the output tree is dominated by already-
+        compressed formats (PDF, docx, xlsx, zipped logs) where DEFLATE
+        burns CPU for near-zero ratio gain. Pass
+        compression=zipfile.ZIP_DEFLATED for text-heavy trees.
         """
         try:
             if not archive_name:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 archive_name = f"webscraper_session_{timestamp}"
-            
+
             archive_path = self.output_dir.parent / f"{archive_name}.zip"
-            
-            shutil.make_archive(
-                str(archive_path.with_suffix('')),
-                'zip',
-                str(self.output_dir)
-            )
-            
+
+            root = str(self.output_dir)
+            with zipfile.ZipFile(archive_path, 'w', compression=compression,
+                                 allowZip64=True) as zf:
+                for dirpath, dirnames, filenames in os.walk(root):
+                    rel_dir = os.path.relpath(dirpath, root)
+                    for name in filenames:
+                        arcname = name if rel_dir == '.' else os.path.join(rel_dir, name)
+                        zf.write(os.path.join(dirpath, name), arcname)
+
             logger.info(f"Session archived: {archive_path}")
             return archive_path
-            
+
         except Exception as e:
             logger.error(f"Could not archive session: {e}")
             raise
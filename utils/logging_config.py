@@ -2,6 +2,7 @@
 Logging configuration for the web scraper
 """
 
+import os
 import sys
 from pathlib import Path
 from loguru import logger
@@ -12,7 +13,7 @@ def setup_logging(output_dir: Path, verbose: bool = False):
     """
     # Remove default handler
     logger.remove()
-    
+
     # Console handler
     log_level = "DEBUG" if verbose else "INFO"
     logger.add(
@@ -21,30 +22,42 @@ def setup_logging(output_dir: Path, verbose: bool = False):
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         colorize=True
     )
-    
-    # File handler for all logs
+
+    # Emitted before the file sinks exist, so it doesn't immediately
+    # force their deferred opens
+    logger.info("Logging configured successfully")
+
+    # File sinks can be disabled entirely (WS_LOG_FILES=0, e.g. for tests
+    # or throwaway runs); delay=True defers the open + rotation scan to
+    # the first emitted record, and enqueue=True moves formatting and
+    # disk writes off the event-loop thread
+    if os.environ.get('WS_LOG_FILES', '1') != '1':
+        return
+
     log_dir = output_dir / 'logs'
     log_dir.mkdir(parents=True, exist_ok=True)
-    
+
     logger.add(
         log_dir / "webscraper.log",
         level="DEBUG",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
         rotation="10 MB",
         retention="7 days",
-        compression="zip"
+        compression="zip",
+        delay=True,
+        enqueue=True
     )
-    
+
     # Error-only file handler
     logger.add(
         log_dir / "errors.log",
         level="ERROR",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
         rotation="5 MB",
-        retention="30 days"
+        retention="30 days",
+        delay=True,
+        enqueue=True
     )
-    
-    logger.info("Logging configured successfully")
 
 def get_logger(name: str):
     """